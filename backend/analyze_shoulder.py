@@ -39,7 +39,7 @@ from app.services.pose_detector import PoseLandmark
 landmarks = landmarks_data['landmarks']
 h = landmarks_data['image_height']
 w = landmarks_data['image_width']
-mask = landmarks_data['segmentation_mask']
+mask = PoseDetector.levels_to_mask(landmarks_data['segmentation_levels'], 0.5)
 
 # Get shoulder landmarks
 l_shoulder_norm = landmarks[PoseLandmark.LEFT_SHOULDER]
@@ -67,7 +67,7 @@ print(f"Shoulder Y-level: {shoulder_y}")
 if mask is not None:
     # Get width at shoulder level
     row = mask[shoulder_y, :]
-    body_pixels = np.where(row > 0.5)[0]
+    body_pixels = np.where(row)[0]
     
     if len(body_pixels) > 0:
         seg_width_px = body_pixels[-1] - body_pixels[0]
@@ -1,5 +1,6 @@
 """API routes for avatar generation."""
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
 from app.models.schemas import (
     AvatarGenerateRequest,
     AvatarResponse,
@@ -14,6 +15,30 @@ from datetime import datetime
 router = APIRouter()
 
 
+def _find_avatar_path(avatar_id: str) -> str:
+    """
+    Find the stored image file of an avatar.
+    
+    Args:
+        avatar_id: Avatar unique identifier
+        
+    Returns:
+        Path of the avatar image
+        
+    Raises:
+        HTTPException: 404 if no avatar with this ID exists
+    """
+    avatar_files = [
+        f for f in os.listdir(avatar_generator.storage_dir)
+        if f.startswith(f"avatar_{avatar_id}")
+    ]
+    
+    if not avatar_files:
+        raise HTTPException(status_code=404, detail="Avatar not found")
+    
+    return os.path.join(avatar_generator.storage_dir, avatar_files[0])
+
+
 @router.post("/generate", response_model=AvatarResponse)
 async def generate_avatar(request: AvatarGenerateRequest):
     """
@@ -74,16 +99,7 @@ async def add_face_to_avatar(request: AvatarFaceMapRequest):
         Updated avatar with face
     """
     try:
-        # Find avatar file
-        avatar_files = [
-            f for f in os.listdir(avatar_generator.storage_dir)
-            if f.startswith(f"avatar_{request.avatar_id}")
-        ]
-        
-        if not avatar_files:
-            raise HTTPException(status_code=404, detail="Avatar not found")
-        
-        avatar_path = os.path.join(avatar_generator.storage_dir, avatar_files[0])
+        avatar_path = _find_avatar_path(request.avatar_id)
         
         # Extract face
         face_data = face_mapper.extract_face(request.face_image)
@@ -123,16 +139,7 @@ async def get_avatar(avatar_id: str):
         Avatar image data
     """
     try:
-        # Find avatar file
-        avatar_files = [
-            f for f in os.listdir(avatar_generator.storage_dir)
-            if f.startswith(f"avatar_{avatar_id}")
-        ]
-        
-        if not avatar_files:
-            raise HTTPException(status_code=404, detail="Avatar not found")
-        
-        avatar_path = os.path.join(avatar_generator.storage_dir, avatar_files[0])
+        avatar_path = _find_avatar_path(avatar_id)
         
         # Read and encode image
         import base64
@@ -149,3 +156,28 @@ async def get_avatar(avatar_id: str):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving avatar: {str(e)}")
+
+
+@router.get("/{avatar_id}/image")
+async def get_avatar_image(avatar_id: str):
+    """
+    Retrieve a generated avatar as a PNG file.
+    
+    Streams the stored image as-is, without the base64 data URL encoding
+    of the JSON endpoints.
+    
+    Args:
+        avatar_id: Avatar unique identifier
+        
+    Returns:
+        Avatar PNG image
+    """
+    try:
+        avatar_path = _find_avatar_path(avatar_id)
+        
+        return FileResponse(avatar_path, media_type="image/png")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving avatar: {str(e)}")
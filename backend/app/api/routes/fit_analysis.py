@@ -4,6 +4,7 @@ from app.models.schemas import (
     FitAnalysisRequest,
     FitAnalysisResponse,
     SizeRecommendRequest,
+    BatchSizeRecommendRequest,
     GarmentInfoResponse
 )
 from app.services.fit_simulator import fit_simulator
@@ -133,15 +134,17 @@ async def analyze_garment_fit(request: FitAnalysisRequest):
         # Sort alternatives by fit score
         alternative_sizes.sort(key=lambda x: x["fit_score"], reverse=True)
         
-        return FitAnalysisResponse(
-            success=True,
-            overall_fit_score=analysis["overall_fit_score"],
-            overall_fit_category=analysis["overall_fit_category"],
-            zones=analysis["zones"],
-            recommendations=analysis["recommendations"],
-            alternative_sizes=alternative_sizes[:3],  # Top 3 alternatives
-            message=f"Fit analysis completed for {garment.name}"
-        )
+        # Returned as a plain dict: response_model validates it once, instead of
+        # building a FitAnalysisResponse here and having FastAPI re-validate it
+        return {
+            "success": True,
+            "overall_fit_score": analysis["overall_fit_score"],
+            "overall_fit_category": analysis["overall_fit_category"],
+            "zones": analysis["zones"],
+            "recommendations": analysis["recommendations"],
+            "alternative_sizes": alternative_sizes[:3],  # Top 3 alternatives
+            "message": f"Fit analysis completed for {garment.name}"
+        }
         
     except HTTPException:
         raise
@@ -204,6 +207,52 @@ async def recommend_size(request: SizeRecommendRequest):
         raise HTTPException(status_code=500, detail=f"Size recommendation failed: {str(e)}")
 
 
+@router.post("/recommend-size-batch")
+async def recommend_size_batch(request: BatchSizeRecommendRequest):
+    """
+    Recommend the best size of a garment for several users in one call.
+    
+    Args:
+        request: Batch size recommendation request
+        
+    Returns:
+        Best size and overall fit score for each user, in request order
+    """
+    try:
+        # Get garment
+        garment = SAMPLE_GARMENTS.get(request.garment_id)
+        if not garment:
+            raise HTTPException(status_code=404, detail="Garment not found")
+        
+        # Score every (user, size) pair at once
+        scores = fit_simulator.analyze_fit_batch(
+            fit_simulator.to_batch_array(request.measurements),
+            fit_simulator.to_batch_array(garment.sizes)
+        )
+        best_indices = scores.argmax(axis=1)
+        
+        results = []
+        for user_scores, best_index in zip(scores, best_indices):
+            best_score = float(user_scores[best_index])
+            results.append({
+                "recommended_size": garment.sizes[best_index].size,
+                "fit_score": best_score,
+                "fit_category": fit_simulator.score_to_category(best_score).value
+            })
+        
+        return {
+            "success": True,
+            "garment_name": garment.name,
+            "results": results,
+            "message": f"Recommended sizes for {len(results)} users"
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch size recommendation failed: {str(e)}")
+
+
 @router.get("/garments", response_model=GarmentInfoResponse)
 async def list_garments(category: str = None):
     """
@@ -73,21 +73,8 @@ async def calculate_measurements(
         # Prepare for MediaPipe
         front_rgb = image_processor.prepare_for_mediapipe(front_image)
         
-        # Detect pose landmarks
-        logger.info("Detecting pose landmarks in front image")
-        front_landmarks = pose_detector.detect_landmarks(front_rgb)
-        
-        if not front_landmarks:
-            return MeasurementResponse(
-                success=False,
-                measurements=None,
-                landmarks_detected=False,
-                confidence_score=None,
-                message="Could not detect pose in front image. Please ensure full body is visible with good lighting."
-            )
-        
         # Process side image if provided
-        side_landmarks = None
+        side_rgb = None
         if request.side_image:
             logger.info("Processing side image")
             try:
@@ -97,17 +84,30 @@ async def calculate_measurements(
                 if is_valid:
                     side_image = image_processor.resize_image(side_image)
                     side_rgb = image_processor.prepare_for_mediapipe(side_image)
-                    side_landmarks = pose_detector.detect_landmarks(side_rgb)
-                    
-                    if side_landmarks:
-                        logger.info(f"Side pose detected with confidence: {side_landmarks['confidence']:.2f}")
-                    else:
-                        logger.warning("Could not detect pose in side image, proceeding with front only")
                 else:
                     logger.warning(f"Side image validation failed: {error_msg}")
             except Exception as e:
                 logger.warning(f"Error processing side image: {str(e)}, proceeding with front only")
         
+        # Detect pose landmarks (front and side views run concurrently)
+        logger.info("Detecting pose landmarks")
+        front_landmarks, side_landmarks = pose_detector.detect_pair(front_rgb, side_rgb)
+        
+        if not front_landmarks:
+            return MeasurementResponse(
+                success=False,
+                measurements=None,
+                landmarks_detected=False,
+                confidence_score=None,
+                message="Could not detect pose in front image. Please ensure full body is visible with good lighting."
+            )
+        
+        if side_rgb is not None:
+            if side_landmarks:
+                logger.info(f"Side pose detected with confidence: {side_landmarks['confidence']:.2f}")
+            else:
+                logger.warning("Could not detect pose in side image, proceeding with front only")
+        
         # Calculate measurements
         logger.info("Calculating measurements")
         measurements_dict = measurement_calculator.calculate_measurements(
@@ -9,7 +9,7 @@ from app.models.schemas import (
     HealthResponse
 )
 from app.models.garment_specs import GarmentCategory, SizeChartDatabase
-from app.services.size_recommender import SizeRecommender
+from app.services.size_recommender import size_recommender
 import logging
 
 # Set up logging
@@ -19,7 +19,6 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # Initialize services
-size_recommender = SizeRecommender()
 size_chart_db = SizeChartDatabase()
 
 
@@ -2,7 +2,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from app.api.routes import measurements
 from app.core.config import settings
 from app.core.database import mongodb
@@ -12,7 +12,8 @@ import os
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
-    description="Body measurement extraction from photos using computer vision"
+    description="Body measurement extraction from photos using computer vision",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
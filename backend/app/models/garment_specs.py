@@ -2,7 +2,7 @@
 from enum import Enum
 from typing import Dict, List, Optional, Tuple
 from pydantic import BaseModel, Field
-import json
+import orjson
 import os
 
 
@@ -51,8 +51,8 @@ class SizeChartDatabase:
         json_path = os.path.join(current_dir, '..', 'data', 'size_charts.json')
         
         try:
-            with open(json_path, 'r') as f:
-                data = json.load(f)
+            with open(json_path, 'rb') as f:
+                data = orjson.loads(f.read())
             
             # Parse JSON into SizeChart objects
             for category_key, category_data in data.items():
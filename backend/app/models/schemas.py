@@ -185,6 +185,12 @@ class SizeRecommendRequest(BaseModel):
     garment_id: str = Field(..., description="Garment ID")
 
 
+class BatchSizeRecommendRequest(BaseModel):
+    """Request for best-size lookup across several users."""
+    measurements: List[Measurements] = Field(..., description="Body measurements, one entry per user")
+    garment_id: str = Field(..., description="Garment ID")
+
+
 class GarmentInfoResponse(BaseModel):
     """Response with available garment information."""
     garments: List[Dict[str, Any]] = Field(..., description="List of available garments")
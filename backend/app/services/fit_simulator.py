@@ -1,5 +1,7 @@
 """Garment fit simulation and analysis service."""
-from typing import Dict, List, Tuple
+from bisect import bisect_right
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
 from app.models.schemas import Measurements, FitZoneAnalysis
 from app.models.garment_data import (
     FitZone, FitCategory, LengthCategory, GarmentSpec
@@ -10,6 +12,27 @@ from app.core.config import settings
 class FitSimulator:
     """Simulate and analyze garment fit based on body measurements."""
     
+    # Column order of the (K, 5) arrays used by analyze_fit_batch
+    BATCH_FIELDS = ("shoulder_width", "chest", "waist", "hip", "inseam")
+    
+    # Upper band edges (inclusive) and (loose/long, tight/short) scores per band,
+    # mirroring _categorize_width_fit and _categorize_circumference_fit
+    _WIDTH_BANDS = np.array([0.02, 0.05, 0.10])
+    _WIDTH_SCORES = np.array([[100.0, 85.0, 65.0, 40.0], [100.0, 75.0, 50.0, 30.0]])
+    _CIRC_BANDS = np.array([0.05, 0.08, 0.15])
+    _CIRC_SCORES = np.array([[40.0, 85.0, 65.0, 40.0], [30.0, 80.0, 60.0, 30.0]])
+    _LENGTH_SCORES = np.array([[100.0, 85.0, 65.0, 45.0], [100.0, 80.0, 60.0, 40.0]])
+    
+    # Lower bounds (inclusive) of each overall score band for score_to_category
+    _SCORE_THRESHOLDS = (50, 65, 80, 95)
+    _SCORE_CATEGORIES = (
+        FitCategory.TOO_LOOSE,
+        FitCategory.LOOSE,
+        FitCategory.SLIGHTLY_LOOSE,
+        FitCategory.GOOD_FIT,
+        FitCategory.PERFECT_FIT
+    )
+    
     def __init__(self):
         """Initialize fit simulator with tolerance settings."""
         self.tol_perfect = settings.fit_tolerance_perfect
@@ -33,7 +56,7 @@ class FitSimulator:
             Dict with overall_fit_score, zones analysis, and recommendations
         """
         zones_analysis = []
-        zone_scores = []
+        total_score = 0.0
         
         # Analyze each relevant measurement zone
         if user_measurements.shoulder_width and garment_spec.shoulder_width:
@@ -44,7 +67,7 @@ class FitSimulator:
                 is_circumference=False
             )
             zones_analysis.append(zone_result)
-            zone_scores.append(zone_result["fit_score"])
+            total_score += zone_result["fit_score"]
         
         if user_measurements.chest and garment_spec.chest:
             zone_result = self._analyze_zone(
@@ -54,7 +77,7 @@ class FitSimulator:
                 is_circumference=True
             )
             zones_analysis.append(zone_result)
-            zone_scores.append(zone_result["fit_score"])
+            total_score += zone_result["fit_score"]
         
         if user_measurements.waist and garment_spec.waist:
             zone_result = self._analyze_zone(
@@ -64,7 +87,7 @@ class FitSimulator:
                 is_circumference=True
             )
             zones_analysis.append(zone_result)
-            zone_scores.append(zone_result["fit_score"])
+            total_score += zone_result["fit_score"]
         
         if user_measurements.hip and garment_spec.hip:
             zone_result = self._analyze_zone(
@@ -74,7 +97,7 @@ class FitSimulator:
                 is_circumference=True
             )
             zones_analysis.append(zone_result)
-            zone_scores.append(zone_result["fit_score"])
+            total_score += zone_result["fit_score"]
         
         if user_measurements.inseam and garment_spec.inseam:
             zone_result = self._analyze_length(
@@ -83,11 +106,12 @@ class FitSimulator:
                 garment_spec.inseam
             )
             zones_analysis.append(zone_result)
-            zone_scores.append(zone_result["fit_score"])
+            total_score += zone_result["fit_score"]
         
         # Calculate overall fit score
-        overall_score = sum(zone_scores) / len(zone_scores) if zone_scores else 0
-        overall_category = self._score_to_category(overall_score)
+        zone_count = len(zones_analysis)
+        overall_score = total_score / zone_count if zone_count else 0.0
+        overall_category = self.score_to_category(overall_score)
         
         # Generate recommendations
         recommendations = self._generate_recommendations(zones_analysis, overall_category)
@@ -99,6 +123,76 @@ class FitSimulator:
             "recommendations": recommendations
         }
     
+    @classmethod
+    def to_batch_array(cls, items: Sequence) -> np.ndarray:
+        """
+        Stack measurement-like objects into a (K, 5) array for analyze_fit_batch.
+        
+        Args:
+            items: Measurements or GarmentSpec objects
+            
+        Returns:
+            Array ordered by BATCH_FIELDS, NaN where a value is missing
+        """
+        array = np.full((len(items), len(cls.BATCH_FIELDS)), np.nan)
+        for row, item in enumerate(items):
+            for col, field in enumerate(cls.BATCH_FIELDS):
+                value = getattr(item, field, None)
+                # Zero counts as missing, matching the truthiness checks in analyze_fit
+                if value:
+                    array[row, col] = value
+        return array
+    
+    def analyze_fit_batch(self, users: np.ndarray, garments: np.ndarray) -> np.ndarray:
+        """
+        Overall fit scores for every (user, garment) pair in one vectorized pass.
+        
+        Produces the same overall_fit_score as analyze_fit, without the
+        per-zone descriptions.
+        
+        Args:
+            users: (N, 5) user measurements ordered by BATCH_FIELDS, NaN if missing
+            garments: (M, 5) garment specs ordered by BATCH_FIELDS, NaN if missing
+            
+        Returns:
+            (N, M) matrix of overall fit scores (0 where no zone is comparable)
+        """
+        users = np.asarray(users, dtype=np.float64)[:, None, :]
+        garments = np.asarray(garments, dtype=np.float64)[None, :, :]
+        
+        with np.errstate(invalid="ignore", divide="ignore"):
+            difference = garments - users
+            relative_diff = np.abs(difference) / users
+        # Row 0 of each score table is used when the garment is larger
+        tight = (difference <= 0).astype(np.intp)
+        
+        scores = np.empty(difference.shape)
+        
+        # Shoulders: relative width bands
+        width_band = np.searchsorted(self._WIDTH_BANDS, relative_diff[..., 0])
+        scores[..., 0] = self._WIDTH_SCORES[tight[..., 0], width_band]
+        
+        # Chest, waist, hips: absolute perfect band, then relative bands
+        circ_band = np.searchsorted(self._CIRC_BANDS, relative_diff[..., 1:4])
+        circ_scores = self._CIRC_SCORES[tight[..., 1:4], circ_band]
+        circ_scaled = difference[..., 1:4] / 100
+        perfect = (circ_scaled >= -0.02) & (circ_scaled <= 0.05)
+        scores[..., 1:4] = np.where(perfect, 100.0, circ_scores)
+        
+        # Inseam: absolute length bands
+        length_bands = np.array([self.length_tol_perfect, self.length_tol_acceptable, 10.0])
+        length_band = np.searchsorted(length_bands, np.abs(difference[..., 4]))
+        scores[..., 4] = self._LENGTH_SCORES[tight[..., 4], length_band]
+        
+        valid = ~np.isnan(difference)
+        total_score = np.where(valid, scores, 0.0).sum(axis=-1)
+        zone_count = valid.sum(axis=-1)
+        overall = np.divide(
+            total_score, zone_count,
+            out=np.zeros(total_score.shape), where=zone_count > 0
+        )
+        return np.round(overall, 2)
+    
     def _analyze_zone(
         self,
         zone: FitZone,
@@ -118,14 +212,6 @@ class FitSimulator:
         Returns:
             Zone analysis dict
         """
-        # Add ease allowance for circumference measurements
-        if is_circumference:
-            # Garments should be 2-5% larger than body for comfortable fit
-            ease_allowance = 0.03  # 3% ease
-            ideal_garment_size = user_measurement * (1 + ease_allowance)
-        else:
-            ideal_garment_size = user_measurement
-        
         # Calculate difference
         difference = garment_measurement - user_measurement
         relative_diff = abs(difference) / user_measurement
@@ -161,8 +247,11 @@ class FitSimulator:
         zone: FitZone
     ) -> Tuple[FitCategory, float, str]:
         """Categorize fit for circumference measurements (chest, waist, hips)."""
-        
-        if -0.02 <= difference / 100 <= 0.05:  # -2% to +5% is perfect
+        # The perfect band is absolute, not relative: difference is in cm and
+        # is divided by a constant 100, so it spans -2cm .. +5cm (centred on
+        # +1.5cm) whatever the body measurement. Outside it, the bands below
+        # use the relative difference.
+        if -0.02 <= difference / 100 <= 0.05:  # -2cm to +5cm is perfect
             return (
                 FitCategory.PERFECT_FIT,
                 100.0,
@@ -318,18 +407,10 @@ class FitSimulator:
             "recommendation": recommendation
         }
     
-    def _score_to_category(self, score: float) -> FitCategory:
+    def score_to_category(self, score: float) -> FitCategory:
         """Convert numerical score to fit category."""
-        if score >= 95:
-            return FitCategory.PERFECT_FIT
-        elif score >= 80:
-            return FitCategory.GOOD_FIT
-        elif score >= 65:
-            return FitCategory.SLIGHTLY_LOOSE
-        elif score >= 50:
-            return FitCategory.LOOSE
-        else:
-            return FitCategory.TOO_LOOSE
+        # bisect_right so a score equal to a threshold lands in the higher band
+        return self._SCORE_CATEGORIES[bisect_right(self._SCORE_THRESHOLDS, score)]
     
     def _zone_recommendation(
         self,
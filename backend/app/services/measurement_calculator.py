@@ -1,8 +1,27 @@
 """Measurement calculation service."""
 import numpy as np
 import math
-from typing import Dict, List, Optional, Tuple
-from app.services.pose_detector import PoseLandmark
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
+from app.services.pose_detector import PoseDetector, PoseLandmark, MEASUREMENT_LANDMARKS
+
+_PI = math.pi
+
+# Rows reduced per step when searching the mask for the top of head
+_TOP_SCAN_BLOCK_ROWS = 64
+
+# Landmark indices used by this module, bound once at import as plain ints
+_NOSE = int(PoseLandmark.NOSE)
+_LEFT_SHOULDER = int(PoseLandmark.LEFT_SHOULDER)
+_RIGHT_SHOULDER = int(PoseLandmark.RIGHT_SHOULDER)
+_LEFT_HIP = int(PoseLandmark.LEFT_HIP)
+_RIGHT_HIP = int(PoseLandmark.RIGHT_HIP)
+_LEFT_KNEE = int(PoseLandmark.LEFT_KNEE)
+_RIGHT_KNEE = int(PoseLandmark.RIGHT_KNEE)
+_LEFT_ANKLE = int(PoseLandmark.LEFT_ANKLE)
+_RIGHT_ANKLE = int(PoseLandmark.RIGHT_ANKLE)
+_MEASURED_LANDMARKS = tuple(MEASUREMENT_LANDMARKS.tolist())
+_MAX_MEASURED_LANDMARK = max(_MEASURED_LANDMARKS)
 
 
 class MeasurementCalculator:
@@ -27,6 +46,23 @@ class MeasurementCalculator:
         }
     }
     
+    # Circumference levels per gender: (position below the shoulders as a fraction
+    # of torso height, half-width of the front search window as a fraction of
+    # shoulder width, how the scanned band is reduced)
+    LEVEL_CONFIG = {
+        'male': {
+            'chest': (0.28, 0.6, 'mean'),
+            'waist': (0.62, 0.55, 'min'), # Narrowest part
+            'hip': (1.0, 0.7, 'max') # Widest part
+        },
+        'female': {
+            # Females usually have higher waist levels and lower hip levels relative to torso
+            'chest': (0.30, 0.6, 'mean'),
+            'waist': (0.65, 0.55, 'min'),
+            'hip': (1.05, 0.7, 'max') # Slightly below the hip landmarks
+        }
+    }
+    
     @staticmethod
     def calculate_distance(point1: Tuple[int, int], point2: Tuple[int, int]) -> float:
         """
@@ -39,7 +75,7 @@ class MeasurementCalculator:
         Returns:
             Distance in pixels
         """
-        return math.sqrt((point2[0] - point1[0])**2 + (point2[1] - point1[1])**2)
+        return math.hypot(point2[0] - point1[0], point2[1] - point1[1])
     
     @staticmethod
     def pixels_to_cm(pixels: float, calibration_factor: float) -> float:
@@ -60,52 +96,156 @@ class MeasurementCalculator:
         """Convert centimeters to inches."""
         return cm / 2.54
     
+    @staticmethod
+    def _threshold_mask(segmentation_mask: Optional[np.ndarray], threshold: float) -> Optional[np.ndarray]:
+        """
+        Threshold a segmentation mask once into a contiguous boolean array.
+        
+        Boolean masks are assumed to be thresholded already and are only made
+        C-contiguous (a no-op when they already are), so row scans read
+        consecutive bytes.
+        """
+        if segmentation_mask is None:
+            return None
+        if segmentation_mask.dtype == bool:
+            return np.ascontiguousarray(segmentation_mask)
+        return np.ascontiguousarray(segmentation_mask > threshold)
+    
+    @staticmethod
+    def _view_mask(view: Optional[Dict]) -> Tuple[Optional[np.ndarray], float, float]:
+        """
+        Get a view's mask with its silhouette (0.5) and body width/depth (0.7) thresholds.
+        
+        PoseDetector results carry quantized 'segmentation_levels', which are
+        returned as-is with the matching level thresholds, so like a raw
+        'segmentation_mask' they are only thresholded inside the scanned regions.
+        """
+        if not view:
+            return None, 0.5, 0.7
+        levels = view.get('segmentation_levels')
+        if levels is not None:
+            return levels, PoseDetector.level_threshold(0.5), PoseDetector.level_threshold(0.7)
+        return view.get('segmentation_mask'), 0.5, 0.7
+    
+    @staticmethod
+    def _find_top_y(segmentation_mask: Optional[np.ndarray], threshold: float = 0.5) -> Optional[int]:
+        """
+        Find the first mask row containing any silhouette pixel (top of head).
+        
+        Args:
+            segmentation_mask: MediaPipe segmentation mask, quantized levels, or
+                a boolean mask already thresholded at 0.5
+            threshold: Silhouette threshold for the mask (ignored for boolean masks)
+            
+        Returns:
+            Row index in pixels, or None if the mask is missing or empty
+        """
+        if segmentation_mask is None:
+            return None
+        # The head is near the top of the frame, so scan in row blocks and stop
+        # at the first block containing the body instead of reducing every row
+        for block_start in range(0, segmentation_mask.shape[0], _TOP_SCAN_BLOCK_ROWS):
+            block = segmentation_mask[block_start:block_start + _TOP_SCAN_BLOCK_ROWS]
+            rows_any = MeasurementCalculator._threshold_mask(block, threshold).any(axis=1)
+            if rows_any.any():
+                return block_start + int(rows_any.argmax())
+        return None
+    
+    @staticmethod
+    def _landmarks_to_array(landmarks: Union[List[Dict], np.ndarray]) -> np.ndarray:
+        """
+        Convert landmarks to a contiguous (N, 4) array of x, y, z, visibility.
+        
+        Missing (None) landmarks become all-zero rows, i.e. not visible.
+        """
+        if isinstance(landmarks, np.ndarray):
+            return np.ascontiguousarray(landmarks, dtype=np.float64)
+        return np.array([
+            (lm['x'], lm['y'], lm.get('z', 0.0), lm['visibility']) if lm is not None else (0.0, 0.0, 0.0, 0.0)
+            for lm in landmarks
+        ], dtype=np.float64).reshape(-1, 4)
+    
+    @staticmethod
+    def _landmark_points(
+        landmarks: np.ndarray,
+        image_width: int,
+        image_height: int
+    ) -> Dict[int, Optional[Tuple[float, float]]]:
+        """
+        Scale the landmarks used for measurements to pixels in one gather.
+        
+        Returns the point for each landmark index in _MEASURED_LANDMARKS, matching
+        what _get_landmark_point returns for that index (None when not visible).
+        """
+        if len(landmarks) > _MAX_MEASURED_LANDMARK:
+            indices = _MEASURED_LANDMARKS
+            picked = landmarks[MEASUREMENT_LANDMARKS]
+        else:
+            indices = [index for index in _MEASURED_LANDMARKS if index < len(landmarks)]
+            picked = landmarks[indices]
+        xy = (picked[:, :2] * (image_width, image_height)).tolist()
+        visible = (picked[:, 3] >= 0.65).tolist()
+        points = dict.fromkeys(_MEASURED_LANDMARKS)
+        points.update((index, tuple(p)) for index, p, v in zip(indices, xy, visible) if v)
+        return points
+    
+    @staticmethod
+    def _pair_y(
+        left: Optional[Tuple[float, float]],
+        right: Optional[Tuple[float, float]]
+    ) -> Optional[float]:
+        """Average Y of a left/right landmark pair, using whichever is visible (None if neither)."""
+        if left and right:
+            return (left[1] + right[1]) / 2
+        if left:
+            return left[1]
+        if right:
+            return right[1]
+        return None
+    
+    @staticmethod
+    def _is_ankle_cutoff(ankle_y: Optional[float], image_height: int) -> bool:
+        """Check if ankles are too close to the bottom edge (likely cut off)."""
+        return ankle_y is not None and ankle_y > image_height * 0.96
+    
     def calculate_calibration_factor(
         self,
-        landmarks: List[Dict],
+        landmarks: Union[List[Dict], np.ndarray],
         image_height: int,
         actual_height_cm: float,
-        segmentation_mask: Optional[np.ndarray] = None
+        segmentation_mask: Optional[np.ndarray] = None,
+        top_y: Optional[int] = None,
+        mask_threshold: float = 0.5
     ) -> Optional[float]:
         """
         Calculate pixels-per-cm calibration factor using known height.
         Uses multi-stage fallback:
         1. Full Body (Top of head to Ankles)
         2. Torso-based (Shoulders to Hips) if legs are missing or cut off.
+        
+        segmentation_mask may be the raw mask or quantized levels, thresholded
+        at mask_threshold, or a boolean mask already thresholded at 0.5. Pass
+        top_y when the top of head has already been found in the mask to skip
+        searching it again.
         """
-        # Get key landmarks
-        l_ankle = self._get_landmark_point(landmarks, PoseLandmark.LEFT_ANKLE, 1, image_height)
-        r_ankle = self._get_landmark_point(landmarks, PoseLandmark.RIGHT_ANKLE, 1, image_height)
-        l_shoulder = self._get_landmark_point(landmarks, PoseLandmark.LEFT_SHOULDER, 1, image_height)
-        r_shoulder = self._get_landmark_point(landmarks, PoseLandmark.RIGHT_SHOULDER, 1, image_height)
-        l_hip = self._get_landmark_point(landmarks, PoseLandmark.LEFT_HIP, 1, image_height)
-        r_hip = self._get_landmark_point(landmarks, PoseLandmark.RIGHT_HIP, 1, image_height)
+        # Get key landmarks (only Y is used, so X is left normalized)
+        points = self._landmark_points(self._landmarks_to_array(landmarks), 1, image_height)
+        l_shoulder = points[_LEFT_SHOULDER]
+        r_shoulder = points[_RIGHT_SHOULDER]
+        l_hip = points[_LEFT_HIP]
+        r_hip = points[_RIGHT_HIP]
         
         # 1. PRIMARY: Full Body Calibration
         # Only use ankles if they are well within the image (not cut off)
-        ankle_y = None
-        if l_ankle and r_ankle:
-            ankle_y = (l_ankle[1] + r_ankle[1]) / 2
-        elif l_ankle:
-            ankle_y = l_ankle[1]
-        elif r_ankle:
-            ankle_y = r_ankle[1]
+        ankle_y = self._pair_y(points[_LEFT_ANKLE], points[_RIGHT_ANKLE])
 
-        # Check if ankles are too close to the bottom (likely cut off)
-        is_cutoff = False
-        if ankle_y is not None and ankle_y > image_height * 0.96:
-            is_cutoff = True
-
-        if ankle_y and not is_cutoff:
+        if ankle_y and not self._is_ankle_cutoff(ankle_y, image_height):
             # Find top of head
-            top_y = None
-            if segmentation_mask is not None:
-                mask_indices = np.where(segmentation_mask > 0.5)
-                if len(mask_indices[0]) > 0:
-                    top_y = np.min(mask_indices[0])
+            if top_y is None:
+                top_y = self._find_top_y(segmentation_mask, mask_threshold)
             
             if top_y is None:
-                nose = self._get_landmark_point(landmarks, PoseLandmark.NOSE, 1, image_height)
+                nose = points[_NOSE]
                 if nose:
                     top_y = nose[1] - (abs(ankle_y - nose[1]) * 0.12)
             
@@ -129,24 +269,25 @@ class MeasurementCalculator:
     
     def _get_landmark_point(
         self,
-        landmarks: List[Dict],
+        landmarks: Union[List[Dict], np.ndarray],
         index: int,
         image_width: int,
         image_height: int
     ) -> Optional[Tuple[float, float]]:
-        """Get landmark coordinates."""
+        """Get landmark coordinates from a landmark list or (N, 4) landmark array."""
         if index >= len(landmarks):
             return None
         
-        landmark = landmarks[index]
+        if isinstance(landmarks, np.ndarray):
+            x, y, _, visibility = landmarks[index].tolist()
+        else:
+            landmark = landmarks[index]
+            x, y, visibility = landmark['x'], landmark['y'], landmark['visibility']
         
-        if landmark['visibility'] < 0.65:
+        if visibility < 0.65:
             return None
         
-        x = landmark['x'] * image_width
-        y = landmark['y'] * image_height
-        
-        return (x, y)
+        return (x * image_width, y * image_height)
 
     def _get_body_dimension_at_y(
         self,
@@ -155,18 +296,21 @@ class MeasurementCalculator:
         image_width: int,
         center_x: Optional[float] = None,
         min_x: Optional[float] = None,
-        max_x: Optional[float] = None
+        max_x: Optional[float] = None,
+        threshold: float = 0.7
     ) -> float:
         """
         Calculate the width/depth of the body silhouette at a specific Y-coordinate.
         
         Args:
-            segmentation_mask: MediaPipe segmentation mask
+            segmentation_mask: MediaPipe segmentation mask, quantized levels, or
+                a boolean mask already thresholded at 0.7
             y_px: Y-coordinate in pixels
             image_width: Image width in pixels
             center_x: Optional center X to search around
             min_x: Optional minimum X to consider
             max_x: Optional maximum X to consider
+            threshold: Body threshold for the mask (ignored for boolean masks)
             
         Returns:
             Dimension in pixels
@@ -174,51 +318,260 @@ class MeasurementCalculator:
         if segmentation_mask is None or y_px < 0 or y_px >= segmentation_mask.shape[0]:
             return 0
         
-        # Get the mask row at y
-        row = segmentation_mask[int(y_px), :]
+        # Single-row case of the block scan: one pass over the row with no
+        # per-segment arrays or Python-level segment search
+        y = int(y_px)
+        return float(self._get_body_dimensions_rows(
+            segmentation_mask, y, y, image_width, center_x=center_x, min_x=min_x, max_x=max_x,
+            threshold=threshold
+        )[0])
+
+    def _get_body_dimensions_rows(
+        self,
+        segmentation_mask: np.ndarray,
+        y_start: int,
+        y_end: int,
+        image_width: int,
+        center_x: Optional[float] = None,
+        min_x: Optional[float] = None,
+        max_x: Optional[float] = None,
+        threshold: float = 0.7
+    ) -> np.ndarray:
+        """
+        Vectorized _get_body_dimension_at_y over every row in [y_start, y_end].
+        
+        Segments are found for the whole row block at once from the runs of body
+        pixels, so the result matches calling _get_body_dimension_at_y row
+        by row without the per-row Python overhead.
         
-        # Apply X constraints if provided
+        Args:
+            segmentation_mask: MediaPipe segmentation mask, quantized levels, or
+                a boolean mask already thresholded at 0.7
+            y_start: First Y-coordinate in pixels (inclusive)
+            y_end: Last Y-coordinate in pixels (inclusive)
+            image_width: Image width in pixels
+            center_x: Optional center X to search around
+            min_x: Optional minimum X to consider
+            max_x: Optional maximum X to consider
+            threshold: Body threshold for the mask (ignored for boolean masks)
+            
+        Returns:
+            Array of dimensions in pixels, one per row (0 where nothing was found)
+        """
+        widths = np.zeros(max(0, y_end - y_start + 1))
+        if segmentation_mask is None:
+            return widths
+        
+        row_lo = max(0, y_start)
+        row_hi = min(segmentation_mask.shape[0], y_end + 1)
+        if row_lo >= row_hi:
+            return widths
+        
+        start, end = self._x_window(min_x, max_x, image_width, segmentation_mask.shape[1])
+        
+        # Higher threshold for better accuracy
+        block = segmentation_mask[row_lo:row_hi, start:end]
+        padded = np.zeros((block.shape[0], block.shape[1] + 2), dtype=bool)
+        padded[:, 1:-1] = block if block.dtype == bool else self._threshold_mask(block, threshold)
+        widths[row_lo - y_start:row_hi - y_start] = self._padded_row_widths(padded, start, image_width, center_x)
+        return widths
+    
+    @staticmethod
+    def _x_window(
+        min_x: Optional[float],
+        max_x: Optional[float],
+        image_width: int,
+        mask_width: int
+    ) -> Tuple[int, int]:
+        """Column range [start, end) to search, applying the optional X constraints."""
         if min_x is not None or max_x is not None:
-            constrained_row = np.zeros_like(row)
             start = int(max(0, min_x if min_x is not None else 0))
             end = int(min(image_width, max_x if max_x is not None else image_width))
-            constrained_row[start:end] = row[start:end]
-            row = constrained_row
-        
-        # Find pixels where mask > 0.7 (higher threshold for better accuracy)
-        body_pixels = np.where(row > 0.7)[0]
+            # Same bounds as slicing a mask row with [start:end]
+            start, end, _ = slice(start, end).indices(mask_width)
+            return start, max(start, end)
+        return 0, mask_width
+    
+    @staticmethod
+    def _padded_row_widths(
+        padded: np.ndarray,
+        col_offset: int,
+        image_width: int,
+        center_x: Optional[float]
+    ) -> np.ndarray:
+        """
+        Body dimension of every row of a thresholded mask block.
         
-        if len(body_pixels) < 2:
-            return 0
+        Args:
+            padded: Boolean block with one background column on each side
+            col_offset: Image column of the first (unpadded) block column
+            image_width: Image width in pixels
+            center_x: Optional center X to search around
+            
+        Returns:
+            Array of dimensions in pixels, one per row (0 where nothing was found)
+        """
+        n_rows = padded.shape[0]
+        
+        # Runs of body pixels in row-major order. With the background padding on
+        # both ends of every row, each run shows up as a start/stop pair of changes.
+        change_rows, changes = np.nonzero(padded[:, 1:] != padded[:, :-1])
+        if change_rows.size == 0:
+            return np.zeros(n_rows)
+        run_rows = change_rows[::2]
+        run_starts = changes[::2]
+        run_stops = changes[1::2]
+        run_len = run_stops - run_starts
+        run_starts = run_starts + col_offset
+        run_last = run_stops - 1 + col_offset
+        
+        # A new segment starts on a new row or after a gap of more than 5 pixels
+        new_segment = np.empty(run_rows.size, dtype=bool)
+        new_segment[0] = True
+        new_segment[1:] = (run_rows[1:] != run_rows[:-1]) | (run_starts[1:] - run_last[:-1] > 5)
+        seg_first = np.flatnonzero(new_segment)
+        seg_last = np.append(seg_first[1:] - 1, run_rows.size - 1)
+        seg_row = run_rows[seg_first]
+        seg_start = run_starts[seg_first]
+        seg_end = run_last[seg_last]
+        seg_len = np.add.reduceat(run_len, seg_first)
         
         if center_x is not None:
-            # Find all continuous segments
-            diff = np.diff(body_pixels)
-            breaks = np.where(diff > 5)[0] # 5 pixel gap is a break
-            segments = np.split(body_pixels, breaks + 1)
-            
             # Filter out very small segments (noise) - must be at least 2% of image width
             min_seg_size = max(2, int(image_width * 0.02))
-            valid_segments = [seg for seg in segments if len(seg) >= min_seg_size]
-            
-            if not valid_segments:
-                return 0
-                
-            # Find segment containing center_x or closest to it
-            for seg in valid_segments:
-                if seg[0] <= center_x <= seg[-1]:
-                    return float(seg[-1] - seg[0])
-            
-            # If no segment contains center_x, take the largest one within reasonable distance
-            best_seg = max(valid_segments, key=len)
-            return float(best_seg[-1] - best_seg[0])
+            valid = seg_len >= min_seg_size
+            contains = valid & (seg_start <= center_x) & (center_x <= seg_end)
+        else:
+            valid = np.ones(seg_row.size, dtype=bool)
+            contains = np.zeros(seg_row.size, dtype=bool)
+        
+        if not (seg_row[1:] == seg_row[:-1]).any():
+            # Common case: at most one segment per row, so it is the chosen one if valid
+            widths = np.zeros(n_rows)
+            widths[seg_row[valid]] = (seg_end - seg_start)[valid]
+            widths[np.bincount(run_rows, weights=run_len, minlength=n_rows) < 2] = 0
+            return widths
+        
+        chosen = np.full(n_rows, -1)
+        
+        # Largest valid segment per row (first one wins ties, like max(..., key=len))
+        candidates = np.flatnonzero(valid)
+        order = candidates[np.lexsort((-seg_len[candidates], seg_row[candidates]))]
+        order_rows = seg_row[order]
+        first = np.ones(order.size, dtype=bool)
+        first[1:] = order_rows[1:] != order_rows[:-1]
+        chosen[order_rows[first]] = order[first]
+        
+        # Segment containing center_x takes precedence
+        containing = np.flatnonzero(contains)
+        containing_rows = seg_row[containing]
+        first = np.ones(containing.size, dtype=bool)
+        first[1:] = containing_rows[1:] != containing_rows[:-1]
+        chosen[containing_rows[first]] = containing[first]
+        
+        widths = np.where(chosen >= 0, (seg_end - seg_start)[chosen], 0).astype(float)
+        widths[np.bincount(run_rows, weights=run_len, minlength=n_rows) < 2] = 0
+        return widths
 
-        # Fallback: take largest segment
-        diff = np.diff(body_pixels)
-        breaks = np.where(diff > 5)[0]
-        segments = np.split(body_pixels, breaks + 1)
-        largest_seg = max(segments, key=len)
-        return float(largest_seg[-1] - largest_seg[0])
+    def _scan_band(
+        self,
+        segmentation_mask: np.ndarray,
+        y_start: int,
+        y_end: int,
+        image_width: int,
+        mode: str,
+        center_x: Optional[float] = None,
+        min_x: Optional[float] = None,
+        max_x: Optional[float] = None,
+        threshold: float = 0.7
+    ) -> float:
+        """
+        Reduce the body dimensions of a band of rows to a single value.
+        
+        Args:
+            segmentation_mask: MediaPipe segmentation mask, quantized levels, or
+                a boolean mask already thresholded at 0.7
+            y_start: First Y-coordinate in pixels (inclusive)
+            y_end: Last Y-coordinate in pixels (inclusive)
+            image_width: Image width in pixels
+            mode: 'min', 'max' or 'mean' over the rows where the body was found
+            center_x: Optional center X to search around
+            min_x: Optional minimum X to consider
+            max_x: Optional maximum X to consider
+            threshold: Body threshold for the mask (ignored for boolean masks)
+            
+        Returns:
+            Dimension in pixels, or 0 if no row in the band found the body
+        """
+        return self._scan_bands(
+            segmentation_mask, [(y_start, y_end, min_x, max_x, mode)], image_width, center_x=center_x,
+            threshold=threshold
+        )[0]
+    
+    def _scan_bands(
+        self,
+        segmentation_mask: np.ndarray,
+        bands: List[Tuple[int, int, Optional[float], Optional[float], str]],
+        image_width: int,
+        center_x: Optional[float] = None,
+        threshold: float = 0.7
+    ) -> List[float]:
+        """
+        Reduce several bands of rows to one dimension each in a single mask pass.
+        
+        The bands are stacked into one block, with columns outside each band's X
+        constraints left as background, and the segment search runs once over
+        the whole block.
+        
+        Args:
+            segmentation_mask: MediaPipe segmentation mask, quantized levels, or
+                a boolean mask already thresholded at 0.7
+            bands: (y_start, y_end, min_x, max_x, mode) per band, as for _scan_band
+            image_width: Image width in pixels
+            center_x: Optional center X to search around
+            threshold: Body threshold for the mask (ignored for boolean masks)
+            
+        Returns:
+            Dimension in pixels per band, 0 where no row in the band found the body
+        """
+        if segmentation_mask is None:
+            return [0.0] * len(bands)
+        
+        mask_height, mask_width = segmentation_mask.shape[:2]
+        band_slices = []
+        for y_start, y_end, min_x, max_x, _ in bands:
+            row_lo = max(0, y_start)
+            row_hi = max(row_lo, min(mask_height, y_end + 1))
+            band_slices.append((row_lo, row_hi) + self._x_window(min_x, max_x, image_width, mask_width))
+        
+        # Stack the bands into one padded block; columns outside a band's window stay background
+        col_lo = min(start for _, _, start, _ in band_slices)
+        col_hi = max(end for _, _, _, end in band_slices)
+        band_sizes = [row_hi - row_lo for row_lo, row_hi, _, _ in band_slices]
+        padded = np.zeros((sum(band_sizes), col_hi - col_lo + 2), dtype=bool)
+        offset = 0
+        for (row_lo, row_hi, start, end), size in zip(band_slices, band_sizes):
+            # Higher threshold for better accuracy
+            block = segmentation_mask[row_lo:row_hi, start:end]
+            padded[offset:offset + size, 1 + start - col_lo:1 + end - col_lo] = (
+                block if block.dtype == bool else self._threshold_mask(block, threshold)
+            )
+            offset += size
+        widths = self._padded_row_widths(padded, col_lo, image_width, center_x)
+        
+        results = []
+        for band, dims in zip(bands, np.split(widths, np.cumsum(band_sizes)[:-1])):
+            dims = dims[dims > 0]
+            mode = band[4]
+            if not dims.size:
+                results.append(0.0)
+            elif mode == 'min':
+                results.append(float(dims.min()))
+            elif mode == 'max':
+                results.append(float(dims.max()))
+            else:
+                results.append(float(dims.mean()))
+        return results
 
     def _calculate_circumference(self, width: float, depth: float) -> float:
         """
@@ -236,10 +589,12 @@ class MeasurementCalculator:
             
         a = width / 2
         b = depth / 2
+        diff = a - b
+        total = a + b
         
         # Ramanujan's approximation
-        h = ((a - b) ** 2) / ((a + b) ** 2)
-        circumference = math.pi * (a + b) * (1 + (3 * h) / (10 + math.sqrt(4 - 3 * h)))
+        h = (diff * diff) / (total * total)
+        circumference = _PI * total * (1 + (3 * h) / (10 + math.sqrt(4 - 3 * h)))
         
         return circumference
     
@@ -247,15 +602,21 @@ class MeasurementCalculator:
         """
         Get estimated measurements based on height and gender.
         """
+        return dict(self._cached_anthropometric_estimate(height_cm, gender))
+    
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _cached_anthropometric_estimate(height_cm: float, gender: str) -> Tuple[Tuple[str, float], ...]:
+        """Cached (name, estimate) pairs behind _get_anthropometric_estimate."""
         gender = gender.lower() if gender else 'male'
-        if gender not in self.ANTHROPOMETRIC_RATIOS:
+        if gender not in MeasurementCalculator.ANTHROPOMETRIC_RATIOS:
             gender = 'male'
             
-        ratios = self.ANTHROPOMETRIC_RATIOS[gender]
-        return {
-            name: height_cm * ratio
+        ratios = MeasurementCalculator.ANTHROPOMETRIC_RATIOS[gender]
+        return tuple(
+            (name, height_cm * ratio)
             for name, ratio in ratios.items()
-        }
+        )
 
     def calculate_measurements(
         self,
@@ -270,48 +631,51 @@ class MeasurementCalculator:
         """
         measurements = {}
         
+        # The silhouette threshold (0.5) finds the top of head, the body threshold
+        # (0.7) is used for width/depth scans; masks are thresholded only where scanned
+        f_mask, f_silhouette_threshold, f_body_threshold = self._view_mask(front_landmarks)
+        f_top_y = self._find_top_y(f_mask, f_silhouette_threshold)
+        
+        # Landmarks as one array per view, shared by every lookup below
+        f_lms = self._landmarks_to_array(front_landmarks.get('landmarks_array', front_landmarks['landmarks']))
+        
         # Get calibration factor from front view using segmentation mask for top of head
         calibration_factor = self.calculate_calibration_factor(
-            front_landmarks['landmarks'],
+            f_lms,
             front_landmarks['image_height'],
             calibration_height_cm,
-            segmentation_mask=front_landmarks.get('segmentation_mask')
+            segmentation_mask=f_mask,
+            top_y=f_top_y,
+            mask_threshold=f_silhouette_threshold
         )
         
         if not calibration_factor:
             return measurements
         
         # Front view data
-        f_lms = front_landmarks['landmarks']
-        f_mask = front_landmarks.get('segmentation_mask')
         f_w = front_landmarks['image_width']
         f_h = front_landmarks['image_height']
         
         # Side view data
-        s_lms = side_landmarks['landmarks'] if side_landmarks else None
-        s_mask = side_landmarks.get('segmentation_mask') if side_landmarks else None
+        s_lms = self._landmarks_to_array(side_landmarks.get('landmarks_array', side_landmarks['landmarks'])) if side_landmarks else None
+        s_mask, s_silhouette_threshold, s_body_threshold = self._view_mask(side_landmarks)
+        s_top_y = self._find_top_y(s_mask, s_silhouette_threshold)
         s_w = side_landmarks['image_width'] if side_landmarks else 0
         s_h = side_landmarks['image_height'] if side_landmarks else 0
+        s_points = self._landmark_points(s_lms, s_w, s_h) if side_landmarks else None
         
         # Get key landmarks (front)
-        l_shoulder = self._get_landmark_point(f_lms, PoseLandmark.LEFT_SHOULDER, f_w, f_h)
-        r_shoulder = self._get_landmark_point(f_lms, PoseLandmark.RIGHT_SHOULDER, f_w, f_h)
-        l_hip = self._get_landmark_point(f_lms, PoseLandmark.LEFT_HIP, f_w, f_h)
-        r_hip = self._get_landmark_point(f_lms, PoseLandmark.RIGHT_HIP, f_w, f_h)
-        nose = self._get_landmark_point(f_lms, PoseLandmark.NOSE, f_w, f_h)
-        l_ankle = self._get_landmark_point(f_lms, PoseLandmark.LEFT_ANKLE, f_w, f_h)
-        r_ankle = self._get_landmark_point(f_lms, PoseLandmark.RIGHT_ANKLE, f_w, f_h)
+        f_points = self._landmark_points(f_lms, f_w, f_h)
+        l_shoulder = f_points[_LEFT_SHOULDER]
+        r_shoulder = f_points[_RIGHT_SHOULDER]
+        l_hip = f_points[_LEFT_HIP]
+        r_hip = f_points[_RIGHT_HIP]
+        l_ankle = f_points[_LEFT_ANKLE]
+        r_ankle = f_points[_RIGHT_ANKLE]
         
         # Check if ankles are cut off (at/near bottom edge)
-        is_cutoff = False
-        if l_ankle and r_ankle:
-            avg_y = (l_ankle[1] + r_ankle[1]) / 2
-            if avg_y > f_h * 0.96:
-                is_cutoff = True
-        elif l_ankle or r_ankle:
-            y = l_ankle[1] if l_ankle else r_ankle[1]
-            if y > f_h * 0.96:
-                is_cutoff = True
+        f_ankle_y = self._pair_y(l_ankle, r_ankle)
+        is_cutoff = self._is_ankle_cutoff(f_ankle_y, f_h)
         
         if not (l_shoulder and r_shoulder and l_hip and r_hip):
             return measurements
@@ -325,7 +689,6 @@ class MeasurementCalculator:
         # 1. Shoulder Width (use segmentation mask for outer shoulder edges, not just skeleton)
         # Previously used skeletal distance which is too narrow for clothing fit
         # Now use the actual body width at shoulder level for accurate shirt sizing
-        # 1. Shoulder Width (use segmentation mask for outer shoulder edges, not just skeleton)
         shoulder_y = (l_shoulder[1] + r_shoulder[1]) / 2
         
         # Calculate torso stats early for scanning usage
@@ -339,66 +702,33 @@ class MeasurementCalculator:
         sh_start = int(shoulder_y)
         sh_end = int(shoulder_y + scan_range_sh)
         
-        shoulder_widths = []
         # Calculate reasonable bounds for shoulder search
         # Should be around center +/- (torso width * 0.8 to 1.5)
         sh_min_x = f_center_x - f_torso_width_px * 1.5
         sh_max_x = f_center_x + f_torso_width_px * 1.5
         
-        for sy in range(sh_start, sh_end + 1):
-            w = self._get_body_dimension_at_y(f_mask, sy, f_w, center_x=f_center_x, min_x=sh_min_x, max_x=sh_max_x)
-            if w > 0:
-                shoulder_widths.append(w)
-        
-        if shoulder_widths:
-            shoulder_width_px = max(shoulder_widths) # Take max width (bi-deltoid)
-        else:
+        # Take max width (bi-deltoid)
+        shoulder_width_px = self._scan_band(
+            f_mask, sh_start, sh_end, f_w, 'max', center_x=f_center_x, min_x=sh_min_x, max_x=sh_max_x,
+            threshold=f_body_threshold
+        )
+        if shoulder_width_px <= 0:
             shoulder_width_px = self._get_body_dimension_at_y(
-                f_mask, int(shoulder_y), f_w, center_x=f_center_x
+                f_mask, int(shoulder_y), f_w, center_x=f_center_x, threshold=f_body_threshold
             )
         
         # Apply correction: We want garment/bi-deltoid width
         shoulder_width_cm = self.pixels_to_cm(shoulder_width_px, calibration_factor)
         measurements['shoulder_width'] = shoulder_width_cm
         
-        # 2. Height (use the same logic as calibration for consistency)
-        ankle_y = (l_ankle[1] + r_ankle[1]) / 2 if (l_ankle and r_ankle) else (l_ankle[1] if l_ankle else r_ankle[1] if r_ankle else f_h)
-        top_y = None
-        if f_mask is not None:
-            mask_indices = np.where(f_mask > 0.5)
-            if len(mask_indices[0]) > 0:
-                top_y = np.min(mask_indices[0])
-        
-        if top_y is None:
-            top_y = nose[1] - (abs(ankle_y - nose[1]) * 0.12) if nose else 0
-            
-        height_px = abs(ankle_y - top_y)
-        measurements['height'] = self.pixels_to_cm(height_px, calibration_factor)
+        # 2. Height is the calibration base, so it is reported as given rather
+        # than measured back from pixels
+        measurements['height'] = calibration_height_cm
+        ankle_y = f_ankle_y if f_ankle_y is not None else f_h
 
-        # Define vertical levels (Y-coordinates)
-        # shoulder_y and hip_y, torso_height already calculated above
-        
-        # Refined Ratios (Anthropometric standards)
-        if gender == 'female':
-            # Females usually have higher waist levels and lower hip levels relative to torso
-            chest_ratio = 0.30
-            waist_ratio = 0.65
-            hip_ratio = 1.05 # Slightly below the hip landmarks
-        else:
-            chest_ratio = 0.28
-            waist_ratio = 0.62
-            hip_ratio = 1.0
-            
-        # Initial levels
-        chest_y = shoulder_y + torso_height * chest_ratio
-        waist_y_base = shoulder_y + torso_height * waist_ratio
-        hip_y_base = shoulder_y + torso_height * hip_ratio
-        
-        levels = {
-            'chest': chest_y,
-            'waist': waist_y_base,
-            'hip': hip_y_base
-        }
+        # Vertical levels (Y-coordinates) are placed along the torso using
+        # refined anthropometric ratios; shoulder_y and torso_height are from above
+        level_config = self.LEVEL_CONFIG['female' if gender == 'female' else 'male']
         
         # Default depth-to-width ratios if side view is missing
         default_depth_ratios = {
@@ -412,110 +742,89 @@ class MeasurementCalculator:
         width_correction = 0.96 # 4% ease subtraction
         depth_correction = 0.94 # 6% ease subtraction
         
-        # f_torso_width_px already calculated above
-
-        # 1. Shoulder Width (use segmentation mask for outer shoulder edges, not just skeleton)
-        shoulder_y = (l_shoulder[1] + r_shoulder[1]) / 2
-
         # Calculate center X and torso bounds for side view
         s_center_x = 0
+        s_calibration_factor = None
         if side_landmarks:
-            s_l_shoulder = self._get_landmark_point(s_lms, PoseLandmark.LEFT_SHOULDER, s_w, s_h)
-            s_r_shoulder = self._get_landmark_point(s_lms, PoseLandmark.RIGHT_SHOULDER, s_w, s_h)
-            s_l_hip = self._get_landmark_point(s_lms, PoseLandmark.LEFT_HIP, s_w, s_h)
-            s_r_hip = self._get_landmark_point(s_lms, PoseLandmark.RIGHT_HIP, s_w, s_h)
+            s_l_shoulder = s_points[_LEFT_SHOULDER]
+            s_r_shoulder = s_points[_RIGHT_SHOULDER]
+            s_l_hip = s_points[_LEFT_HIP]
+            s_r_hip = s_points[_RIGHT_HIP]
             
             points = [p for p in [s_l_shoulder, s_r_shoulder, s_l_hip, s_r_hip] if p]
             if points:
                 s_center_x = sum(p[0] for p in points) / len(points)
-
-        for name, y_px in levels.items():
-            # SCANNING MECHANISM
-            # For waist and hips, we scan a small range (+/- 5% of torso height) 
-            # to find the absolute minimum (waist) and maximum (hips) width/depth
-            scan_range = int(torso_height * 0.08)
-            y_start = int(y_px - scan_range)
-            y_end = int(y_px + scan_range)
-            
-            best_width_px = 0
-            best_depth_cm = 0
             
+            # Side calibration and alignment do not depend on the level, so do them once
+            if s_mask is not None:
+                s_calibration_factor = self.calculate_calibration_factor(
+                    s_lms, s_h, calibration_height_cm, segmentation_mask=s_mask, top_y=s_top_y,
+                    mask_threshold=s_silhouette_threshold
+                )
+            
+            if s_calibration_factor:
+                # Align Y in side view
+                s_shoulder_y = self._pair_y(s_l_shoulder, s_r_shoulder) or 0
+                s_hip_y = self._pair_y(s_l_hip, s_r_hip) or 0
+                s_torso_height = s_hip_y - s_shoulder_y
+                s_scan_range = int(s_torso_height * 0.08)
+                
+                s_max_depth_px = f_torso_width_px * 0.8 * (s_calibration_factor / calibration_factor)
+                s_min_x_level = s_center_x - s_max_depth_px / 2
+                s_max_x_level = s_center_x + s_max_depth_px / 2
+        
+        # Anthropometric estimate used for hybrid fusion of every measurement
+        ae_measurements = self._get_anthropometric_estimate(calibration_height_cm, gender)
+        
+        # SCANNING MECHANISM
+        # For waist and hips, we scan a small range (+/- 8% of torso height)
+        # to find the absolute minimum (waist) and maximum (hips) width/depth
+        scan_range = int(torso_height * 0.08)
+        
+        # Bands for every level, scanned together in one pass per view
+        front_bands = []
+        side_bands = []
+        for level_ratio, window_ratio, scan_mode in level_config.values():
             # Constraints for width extraction
-            if name == 'chest':
-                min_x_level = f_center_x - f_torso_width_px * 0.6
-                max_x_level = f_center_x + f_torso_width_px * 0.6
-            elif name == 'waist':
-                min_x_level = f_center_x - f_torso_width_px * 0.55
-                max_x_level = f_center_x + f_torso_width_px * 0.55
-            else: # hip
-                min_x_level = f_center_x - f_torso_width_px * 0.7
-                max_x_level = f_center_x + f_torso_width_px * 0.7
+            y_px = shoulder_y + torso_height * level_ratio
+            half_window = f_torso_width_px * window_ratio
+            front_bands.append((
+                int(y_px - scan_range), int(y_px + scan_range),
+                f_center_x - half_window, f_center_x + half_window, scan_mode
+            ))
+            
+            if s_calibration_factor:
+                # Target Y in side view
+                s_target_y = s_shoulder_y + s_torso_height * level_ratio
+                side_bands.append((
+                    int(s_target_y - s_scan_range), int(s_target_y + s_scan_range),
+                    s_min_x_level, s_max_x_level, scan_mode
+                ))
+        
+        front_widths_px = self._scan_bands(f_mask, front_bands, f_w, center_x=f_center_x, threshold=f_body_threshold)
+        side_depths_px = (
+            self._scan_bands(s_mask, side_bands, s_w, center_x=s_center_x, threshold=s_body_threshold)
+            if side_bands else None
+        )
 
-            # Scanning loop for Front View
-            widths = []
-            for scan_y in range(y_start, y_end + 1):
-                w = self._get_body_dimension_at_y(f_mask, scan_y, f_w, center_x=f_center_x, min_x=min_x_level, max_x=max_x_level)
-                if w > 0:
-                    widths.append(w)
-            
-            if not widths:
+        for i, (name, (level_ratio, _, _)) in enumerate(level_config.items()):
+            best_depth_cm = 0
+            best_width_px = front_widths_px[i]
+            
+            if best_width_px <= 0:
                 # Fallback to single point if scan fails
-                best_width_px = self._get_body_dimension_at_y(f_mask, y_px, f_w, center_x=f_center_x, min_x=min_x_level, max_x=max_x_level)
-            elif name == 'waist':
-                best_width_px = min(widths) # Narrowest part
-            elif name == 'hip':
-                best_width_px = max(widths) # Widest part
-            else:
-                best_width_px = sum(widths) / len(widths) # Average for chest/other
+                _, _, min_x_level, max_x_level, _ = front_bands[i]
+                y_px = shoulder_y + torso_height * level_ratio
+                best_width_px = self._get_body_dimension_at_y(
+                    f_mask, y_px, f_w, center_x=f_center_x, min_x=min_x_level, max_x=max_x_level,
+                    threshold=f_body_threshold
+                )
 
             width_cm = self.pixels_to_cm(best_width_px, calibration_factor) * width_correction
             
-            # Side view scanning
-            if side_landmarks and s_mask is not None:
-                s_calibration_factor = self.calculate_calibration_factor(s_lms, s_h, calibration_height_cm, segmentation_mask=s_mask)
-                if s_calibration_factor:
-                    # Align Y in side view
-                    s_l_shoulder = self._get_landmark_point(s_lms, PoseLandmark.LEFT_SHOULDER, s_w, s_h)
-                    s_r_shoulder = self._get_landmark_point(s_lms, PoseLandmark.RIGHT_SHOULDER, s_w, s_h)
-                    s_shoulder_y = (s_l_shoulder[1] + s_r_shoulder[1]) / 2 if (s_l_shoulder and s_r_shoulder) else (s_l_shoulder[1] if s_l_shoulder else s_r_shoulder[1] if s_r_shoulder else 0)
-                    
-                    s_l_hip = self._get_landmark_point(s_lms, PoseLandmark.LEFT_HIP, s_w, s_h)
-                    s_r_hip = self._get_landmark_point(s_lms, PoseLandmark.RIGHT_HIP, s_w, s_h)
-                    s_hip_y = (s_l_hip[1] + s_r_hip[1]) / 2 if (s_l_hip and s_r_hip) else (s_l_hip[1] if s_l_hip else s_r_hip[1] if s_r_hip else 0)
-                    
-                    s_torso_height = s_hip_y - s_shoulder_y
-                    
-                    # Target Y in side view
-                    if name == 'chest':
-                        s_target_y = s_shoulder_y + s_torso_height * chest_ratio
-                    elif name == 'waist':
-                        s_target_y = s_shoulder_y + s_torso_height * waist_ratio
-                    else: # hip
-                        s_target_y = s_shoulder_y + s_torso_height * hip_ratio
-                    
-                    s_scan_range = int(s_torso_height * 0.08)
-                    s_y_start = int(s_target_y - s_scan_range)
-                    s_y_end = int(s_target_y + s_scan_range)
-                    
-                    s_max_depth_px = f_torso_width_px * 0.8 * (s_calibration_factor / calibration_factor)
-                    s_min_x_level = s_center_x - s_max_depth_px / 2
-                    s_max_x_level = s_center_x + s_max_depth_px / 2
-                    
-                    depths = []
-                    for s_scan_y in range(s_y_start, s_y_end + 1):
-                        d = self._get_body_dimension_at_y(s_mask, s_scan_y, s_w, center_x=s_center_x, min_x=s_min_x_level, max_x=s_max_x_level)
-                        if d > 0:
-                            depths.append(d)
-                    
-                    if depths:
-                        if name == 'waist':
-                            best_depth_px = min(depths)
-                        elif name == 'hip':
-                            best_depth_px = max(depths)
-                        else:
-                            best_depth_px = sum(depths) / len(depths)
-                        
-                        best_depth_cm = self.pixels_to_cm(best_depth_px, s_calibration_factor) * depth_correction
+            # Side view depth
+            if side_depths_px and side_depths_px[i] > 0:
+                best_depth_cm = self.pixels_to_cm(side_depths_px[i], s_calibration_factor) * depth_correction
             
             # Fallback for depth
             if best_depth_cm <= 0:
@@ -525,8 +834,6 @@ class MeasurementCalculator:
             cv_circ = self._calculate_circumference(width_cm, best_depth_cm)
             
             # HYBRID FUSION
-            # Get anthropometric estimate
-            ae_measurements = self._get_anthropometric_estimate(calibration_height_cm, gender)
             ae_val = ae_measurements.get(name, cv_circ)
             
             # SELF-HEALING: If vision found almost nothing, trust AE entirely
@@ -570,8 +877,8 @@ class MeasurementCalculator:
             
         # 6. Inseam (crotch to ankle)
         # Use knee landmark if visible to refine crotch position
-        l_knee = self._get_landmark_point(f_lms, PoseLandmark.LEFT_KNEE, f_w, f_h)
-        r_knee = self._get_landmark_point(f_lms, PoseLandmark.RIGHT_KNEE, f_w, f_h)
+        l_knee = f_points[_LEFT_KNEE]
+        r_knee = f_points[_RIGHT_KNEE]
         
         if l_knee and r_knee:
             knee_y = (l_knee[1] + r_knee[1]) / 2
@@ -580,8 +887,7 @@ class MeasurementCalculator:
         else:
             crotch_y = hip_y + (torso_height * 0.18)
             
-        ankle_y_val = (l_ankle[1] + r_ankle[1]) / 2 if (l_ankle and r_ankle) else (l_ankle[1] if l_ankle else r_ankle[1] if r_ankle else f_h)
-        inseam_px = abs(ankle_y_val - crotch_y)
+        inseam_px = abs(ankle_y - crotch_y)
         cv_inseam = self.pixels_to_cm(inseam_px, calibration_factor)
         
         # Fuse Inseam
@@ -613,10 +919,6 @@ class MeasurementCalculator:
             
         measurements['shoulder_width'] = fused_shoulder
         
-        # All measurements are now in measurements dict
-        # Ensure height is included and not fused (it's the calibration base)
-        measurements['height'] = calibration_height_cm
-        
         # Convert to imperial if requested
         if units == "imperial":
             measurements = {
@@ -1,9 +1,18 @@
 """Pose detection service using MediaPipe."""
+import logging
 import mediapipe as mp
 import numpy as np
-from typing import Optional, List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
+from typing import Optional, List, Dict, Tuple
 from app.core.config import settings
 
+# Segmentation mask thresholds used by measurement extraction. Masks are stored
+# as uint8 levels counting how many of these thresholds each pixel exceeds.
+SEGMENTATION_THRESHOLDS = (0.5, 0.7)
+
+logger = logging.getLogger(__name__)
+
 
 class PoseDetector:
     """Singleton pose detector using MediaPipe."""
@@ -29,8 +38,120 @@ class PoseDetector:
             enable_segmentation=True,
             min_detection_confidence=settings.mediapipe_min_detection_confidence,
         )
+        # Second model and its worker thread for two-view detection, created on
+        # first use. MediaPipe graphs are not thread-safe, so this model is only
+        # ever used from that one worker thread.
+        self.pose_secondary = None
+        self._secondary_executor = None
         self._initialized = True
     
+    @staticmethod
+    def quantize_mask(segmentation_mask: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        """
+        Quantize a float segmentation mask to uint8 threshold levels.
+        
+        A pixel's level is the number of SEGMENTATION_THRESHOLDS it exceeds, so
+        comparing against a level is equivalent to comparing the float mask
+        against the matching threshold, at a quarter of the memory. Detection
+        results carry the levels under 'segmentation_levels'; read them back
+        with levels_to_mask.
+        
+        Args:
+            segmentation_mask: Float mask from MediaPipe, or None
+            
+        Returns:
+            C-contiguous uint8 mask (whatever the input layout), or None if no
+            mask was given
+        """
+        if segmentation_mask is None:
+            return None
+        levels = np.zeros(segmentation_mask.shape, dtype=np.uint8)
+        for threshold in SEGMENTATION_THRESHOLDS:
+            levels += segmentation_mask > threshold
+        return levels
+    
+    @staticmethod
+    def levels_to_mask(levels: Optional[np.ndarray], threshold: float) -> Optional[np.ndarray]:
+        """
+        Threshold quantized mask levels into a boolean mask.
+        
+        Args:
+            levels: uint8 levels from quantize_mask, or None
+            threshold: One of SEGMENTATION_THRESHOLDS
+            
+        Returns:
+            Boolean mask equal to float_mask > threshold, or None if no levels
+            were given
+        """
+        if levels is None:
+            return None
+        return levels > PoseDetector.level_threshold(threshold)
+    
+    @staticmethod
+    def level_threshold(threshold: float) -> int:
+        """
+        Get the level matching a segmentation threshold.
+        
+        levels > level_threshold(threshold) equals float_mask > threshold, so
+        quantized levels can be thresholded with the same comparison as the
+        float mask.
+        
+        Args:
+            threshold: One of SEGMENTATION_THRESHOLDS
+            
+        Returns:
+            Level to compare quantized levels against
+        """
+        return SEGMENTATION_THRESHOLDS.index(threshold)
+    
+    def _detect_with_secondary(self, image: np.ndarray) -> Optional[Dict]:
+        """Detect pose landmarks with the secondary model (runs on its worker thread)."""
+        if self.pose_secondary is None:
+            self.pose_secondary = self.mp_pose.Pose(
+                static_image_mode=True,
+                model_complexity=settings.mediapipe_model_complexity,
+                enable_segmentation=True,
+                min_detection_confidence=settings.mediapipe_min_detection_confidence,
+            )
+        return self._extract_results(self.pose_secondary.process(image), image)
+    
+    def detect_pair(
+        self,
+        front_image: np.ndarray,
+        side_image: Optional[np.ndarray]
+    ) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        Detect pose landmarks in the front and side views concurrently.
+        
+        MediaPipe releases the GIL during inference, so the side view runs on a
+        worker thread with its own model while the front view runs here.
+        
+        Args:
+            front_image: RGB front image (numpy array)
+            side_image: RGB side image, or None for front-only detection
+            
+        Returns:
+            Tuple of (front, side) detection results, as from detect_landmarks.
+            The side result is None if side detection raised; errors from the
+            front view are raised to the caller.
+        """
+        if side_image is None:
+            return self.detect_landmarks(front_image), None
+        
+        if self._secondary_executor is None:
+            self._secondary_executor = ThreadPoolExecutor(max_workers=1)
+        side_future = self._secondary_executor.submit(self._detect_with_secondary, side_image)
+        try:
+            front_result = self.detect_landmarks(front_image)
+        finally:
+            # Always wait for the side view so its model is idle before the next call
+            side_error = side_future.exception()
+        
+        if side_error is not None:
+            logger.warning(f"Error detecting pose in side image: {str(side_error)}, proceeding with front only")
+            return front_result, None
+        return front_result, side_future.result()
+    
     def detect_landmarks(self, image: np.ndarray) -> Optional[Dict]:
         """
         Detect pose landmarks in an image.
@@ -42,30 +163,34 @@ class PoseDetector:
             Dictionary with landmarks and metadata, or None if detection failed
         """
         # Process image
-        results = self.pose.process(image)
-        
+        return self._extract_results(self.pose.process(image), image)
+    
+    def _extract_results(self, results, image: np.ndarray) -> Optional[Dict]:
+        """Convert MediaPipe Pose results into the detection result dictionary."""
         if not results.pose_landmarks:
             return None
         
-        # Extract landmarks
-        landmarks = []
-        for landmark in results.pose_landmarks.landmark:
-            landmarks.append({
-                'x': landmark.x,
-                'y': landmark.y,
-                'z': landmark.z,
-                'visibility': landmark.visibility
-            })
+        # Extract landmarks as one (N, 4) array of x, y, z, visibility for the
+        # measurement math, plus the dict form used in API responses
+        landmarks_array = np.array([
+            (landmark.x, landmark.y, landmark.z, landmark.visibility)
+            for landmark in results.pose_landmarks.landmark
+        ], dtype=np.float64)
+        landmarks = [
+            {'x': x, 'y': y, 'z': z, 'visibility': visibility}
+            for x, y, z, visibility in landmarks_array.tolist()
+        ]
         
         # Calculate average visibility/confidence
-        avg_confidence = sum(lm['visibility'] for lm in landmarks) / len(landmarks)
+        avg_confidence = float(landmarks_array[:, 3].mean())
         
         return {
             'landmarks': landmarks,
+            'landmarks_array': landmarks_array,
             'confidence': avg_confidence,
             'image_width': image.shape[1],
             'image_height': image.shape[0],
-            'segmentation_mask': results.segmentation_mask if hasattr(results, 'segmentation_mask') else None
+            'segmentation_levels': self.quantize_mask(getattr(results, 'segmentation_mask', None))
         }
     
     def get_landmark_coords(self, landmarks: List[Dict], index: int, image_width: int, image_height: int) -> Optional[tuple]:
@@ -100,10 +225,14 @@ class PoseDetector:
         """Release resources."""
         if hasattr(self, 'pose'):
             self.pose.close()
+        if getattr(self, '_secondary_executor', None) is not None:
+            self._secondary_executor.shutdown(wait=True)
+        if getattr(self, 'pose_secondary', None) is not None:
+            self.pose_secondary.close()
 
 
 # MediaPipe Pose Landmark indices (for reference)
-class PoseLandmark:
+class PoseLandmark(IntEnum):
     """MediaPipe Pose landmark indices."""
     NOSE = 0
     LEFT_EYE_INNER = 1
@@ -138,3 +267,17 @@ class PoseLandmark:
     RIGHT_HEEL = 30
     LEFT_FOOT_INDEX = 31
     RIGHT_FOOT_INDEX = 32
+
+
+# Landmarks used for body measurements, as an index array for one-step gathers
+MEASUREMENT_LANDMARKS = np.array([
+    PoseLandmark.NOSE,
+    PoseLandmark.LEFT_SHOULDER,
+    PoseLandmark.RIGHT_SHOULDER,
+    PoseLandmark.LEFT_HIP,
+    PoseLandmark.RIGHT_HIP,
+    PoseLandmark.LEFT_KNEE,
+    PoseLandmark.RIGHT_KNEE,
+    PoseLandmark.LEFT_ANKLE,
+    PoseLandmark.RIGHT_ANKLE,
+], dtype=np.intp)
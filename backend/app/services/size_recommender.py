@@ -1,6 +1,10 @@
 """Size recommendation service."""
+import heapq
 import math
-from typing import Dict, List, Optional, Tuple
+import numpy as np
+from bisect import bisect_right
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 from app.models.garment_specs import GarmentCategory, SizeChart, SizeChartDatabase, SizeSpecification
 
 
@@ -11,7 +15,7 @@ class SizeRecommendation:
         self,
         size: str,
         fit_score: float,
-        measurements: Dict[str, float],
+        measurements: Mapping[str, float],
         fit_analysis: Dict[str, str]
     ):
         self.size = size
@@ -23,8 +27,58 @@ class SizeRecommendation:
 class SizeRecommender:
     """Service for recommending garment sizes based on body measurements."""
     
+    # Size chart measurements compared against the user's measurements
+    CHART_FIELDS = ('chest', 'waist', 'hip', 'shoulder_width', 'inseam')
+    
+    # Within-tolerance fit labels, split at 33% and 67% of the tolerance
+    _TOLERANCE_FRACTIONS = (0.33, 0.67)
+    _IN_TOLERANCE_LABELS = ("Excellent fit", "Great fit", None)
+    
+    # Fit categories by minimum fit score
+    _FIT_CATEGORY_THRESHOLDS = (45, 60, 75, 90)
+    _FIT_CATEGORY_LABELS = ("Poor Fit", "Acceptable", "Good Fit", "Great Fit", "Perfect Fit")
+    
     def __init__(self):
         self.db = SizeChartDatabase()
+        # Per-category (size names, (sizes, fields) spec matrix, read-only spec dicts),
+        # built on first use; the spec dicts are shared with the returned recommendations
+        self._chart_arrays: Dict[GarmentCategory, Tuple[List[str], np.ndarray, List[Mapping]]] = {}
+        
+        # Weights and tolerances only depend on the category, so build them once,
+        # also as arrays aligned with CHART_FIELDS for the vectorized scoring
+        self._weights_by_category = {
+            category: self._get_weights_for_category(category) for category in GarmentCategory
+        }
+        self._tolerances_by_category = {
+            category: self._get_tolerance_for_category(category) for category in GarmentCategory
+        }
+        self._field_weights_by_category = {
+            category: np.array([weights.get(field, 0) for field in self.CHART_FIELDS], dtype=np.float64)
+            for category, weights in self._weights_by_category.items()
+        }
+        self._field_tolerances_by_category = {
+            category: np.array([tolerances.get(field, 3) for field in self.CHART_FIELDS], dtype=np.float64)
+            for category, tolerances in self._tolerances_by_category.items()
+        }
+    
+    def _get_chart_arrays(
+        self,
+        category: GarmentCategory,
+        size_chart: SizeChart
+    ) -> Tuple[List[str], np.ndarray, List[Mapping]]:
+        """Get a size chart as a (sizes, CHART_FIELDS) array, with NaN for missing specs."""
+        arrays = self._chart_arrays.get(category)
+        if arrays is None:
+            size_names = list(size_chart.sizes)
+            specs = np.array([
+                [getattr(spec, field) if getattr(spec, field) is not None else np.nan for field in self.CHART_FIELDS]
+                for spec in size_chart.sizes.values()
+            ], dtype=np.float64).reshape(len(size_names), len(self.CHART_FIELDS))
+            # Read-only views, so a caller mutating a recommendation's measurements
+            # raises instead of changing every later recommendation
+            spec_dicts = [MappingProxyType(spec.model_dump(exclude_none=True)) for spec in size_chart.sizes.values()]
+            arrays = self._chart_arrays[category] = (size_names, specs, spec_dicts)
+        return arrays
     
     def _get_weights_for_category(self, category: GarmentCategory) -> Dict[str, float]:
         """Get measurement weights based on garment category."""
@@ -113,26 +167,80 @@ class SizeRecommender:
         if not size_chart:
             return []
         
-        recommendations = []
+        size_names, specs, spec_dicts = self._get_chart_arrays(category, size_chart)
+        fit_scores = self._calculate_fit_scores(user_measurements, specs, category)
+        
+        # Top fit scores (descending); like a stable sort, ties keep chart order
+        ranked = heapq.nlargest(top_n, range(len(size_names)), key=fit_scores.__getitem__)
         
-        for size_name, size_spec in size_chart.sizes.items():
-            fit_score, fit_analysis = self._calculate_fit_score(
+        recommendations = []
+        for i in ranked:
+            # Fit analysis text is only needed for the sizes that are returned
+            size_name = size_names[i]
+            _, fit_analysis = self._calculate_fit_score(
                 user_measurements,
-                size_spec,
+                size_chart.sizes[size_name],
                 category
             )
             
             recommendations.append(SizeRecommendation(
                 size=size_name,
-                fit_score=fit_score,
-                measurements=size_spec.dict(exclude_none=True),
+                fit_score=fit_scores[i],
+                measurements=spec_dicts[i],
                 fit_analysis=fit_analysis
             ))
         
-        # Sort by fit score (descending)
-        recommendations.sort(key=lambda x: x.fit_score, reverse=True)
+        return recommendations
+    
+    def _calculate_fit_scores(
+        self,
+        user_measurements: Dict[str, float],
+        specs: np.ndarray,
+        category: GarmentCategory
+    ) -> List[float]:
+        """
+        Calculate the fit score of every size in a chart at once.
+        
+        Scores each size exactly like _calculate_fit_score, with one NumPy pass
+        per measurement over all sizes instead of one Python pass per size.
         
-        return recommendations[:top_n]
+        Args:
+            user_measurements: Dictionary of user measurements in cm
+            specs: (sizes, CHART_FIELDS) array of size specs, NaN where missing
+            category: Garment category
+            
+        Returns:
+            Fit score (0-100) of each size, in chart order
+        """
+        field_weights = self._field_weights_by_category[category]
+        field_tolerances = self._field_tolerances_by_category[category]
+        
+        total_score = np.zeros(specs.shape[0])
+        total_weight = np.zeros(specs.shape[0])
+        
+        # Accumulate in the user's measurement order, as the per-size loop does
+        for measurement_name, user_value in user_measurements.items():
+            if user_value is None or measurement_name not in self.CHART_FIELDS:
+                continue
+            
+            field = self.CHART_FIELDS.index(measurement_name)
+            garment_values = specs[:, field]
+            has_spec = ~np.isnan(garment_values)
+            
+            diff = np.abs(user_value - garment_values)
+            tolerance = field_tolerances[field]
+            score = np.where(
+                diff <= tolerance,
+                100 - (diff / tolerance) * 10,
+                np.maximum(0, 100 - ((diff - tolerance) / tolerance) * 50)
+            )
+            
+            weight = field_weights[field]
+            total_score += np.where(has_spec, score * weight, 0)
+            total_weight += np.where(has_spec, weight, 0)
+        
+        final_scores = np.divide(total_score, total_weight, out=np.zeros_like(total_score), where=total_weight > 0)
+        return [round(score, 1) for score in final_scores.tolist()]
     
     def _calculate_fit_score(
         self,
@@ -153,8 +261,8 @@ class SizeRecommender:
         fit_analysis = {}
         
         # Get category-specific weights and tolerances
-        weights = self._get_weights_for_category(category)
-        tolerances = self._get_tolerance_for_category(category)
+        weights = self._weights_by_category[category]
+        tolerances = self._tolerances_by_category[category]
         
         # Compare each measurement
         for measurement_name, user_value in user_measurements.items():
@@ -200,18 +308,18 @@ class SizeRecommender:
                     # This ensures closer matches get higher scores
                     score = 100 - (diff / tolerance) * 10
                     
-                    # More nuanced fit analysis
+                    # More nuanced fit analysis: very close (within 1cm for 3cm
+                    # tolerance) is excellent, close (within 2cm) is great
+                    label = self._IN_TOLERANCE_LABELS[bisect_right(
+                        (tolerance * self._TOLERANCE_FRACTIONS[0], tolerance * self._TOLERANCE_FRACTIONS[1]),
+                        diff
+                    )]
                     if diff == 0:
                         fit_analysis[measurement_name] = "Perfect fit"
-                    elif diff < tolerance * 0.33:  # Very close (within 1cm for 3cm tolerance)
-                        fit_analysis[measurement_name] = "Excellent fit"
-                    elif diff < tolerance * 0.67:  # Close (within 2cm for 3cm tolerance)
-                        fit_analysis[measurement_name] = "Great fit"
+                    elif label is not None:
+                        fit_analysis[measurement_name] = label
                     else:  # Within tolerance but on the edge
-                        if user_value > garment_value:
-                            fit_analysis[measurement_name] = f"Good fit (snug)"
-                        else:
-                            fit_analysis[measurement_name] = f"Good fit (relaxed)"
+                        fit_analysis[measurement_name] = "Good fit (snug)" if user_value > garment_value else "Good fit (relaxed)"
                 else:
                     # Outside tolerance - calculate penalty
                     excess = diff - tolerance
@@ -237,13 +345,7 @@ class SizeRecommender:
     
     def get_fit_category(self, fit_score: float) -> str:
         """Get human-readable fit category."""
-        if fit_score >= 90:
-            return "Perfect Fit"
-        elif fit_score >= 75:
-            return "Great Fit"
-        elif fit_score >= 60:
-            return "Good Fit"
-        elif fit_score >= 45:
-            return "Acceptable"
-        else:
-            return "Poor Fit"
+        return self._FIT_CATEGORY_LABELS[bisect_right(self._FIT_CATEGORY_THRESHOLDS, fit_score)]
+
+# Singleton instance
+size_recommender = SizeRecommender()
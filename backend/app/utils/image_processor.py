@@ -1,5 +1,6 @@
 """Image processing utilities."""
 import base64
+import binascii
 import io
 import numpy as np
 from PIL import Image
@@ -10,6 +11,14 @@ from typing import Tuple, Optional
 class ImageProcessor:
     """Handles image preprocessing and format conversions."""
     
+    # Baseline JPEG at PIL's default quality; progressive and optimized Huffman
+    # encoding need extra passes over the image, so keep them off
+    JPEG_ENCODE_PARAMS = (
+        cv2.IMWRITE_JPEG_QUALITY, 75,
+        cv2.IMWRITE_JPEG_PROGRESSIVE, 0,
+        cv2.IMWRITE_JPEG_OPTIMIZE, 0,
+    )
+    
     @staticmethod
     def base64_to_image(base64_string: str) -> np.ndarray:
         """
@@ -25,10 +34,21 @@ class ImageProcessor:
         if "," in base64_string:
             base64_string = base64_string.split(",")[1]
         
-        # Decode base64
-        image_bytes = base64.b64decode(base64_string)
-        
-        # Convert to PIL Image
+        # Decode base64 with the C decoder that base64.b64decode wraps; it accepts
+        # the ASCII string directly and still rejects bad padding
+        image_bytes = binascii.a2b_base64(base64_string)
+        
+        # Decode straight to BGR with OpenCV; like PIL, keep the stored pixel
+        # orientation instead of applying the EXIF rotation
+        if image_bytes:
+            image_bgr = cv2.imdecode(
+                np.frombuffer(image_bytes, dtype=np.uint8),
+                cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION
+            )
+            if image_bgr is not None:
+                return image_bgr
+        
+        # Fall back to PIL for formats OpenCV cannot decode
         pil_image = Image.open(io.BytesIO(image_bytes))
         
         # Convert to RGB if necessary
@@ -54,18 +74,11 @@ class ImageProcessor:
         Returns:
             Base64 encoded image string
         """
-        # Convert BGR to RGB
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        
-        # Convert to PIL Image
-        pil_image = Image.fromarray(image_rgb)
+        # Encode as JPEG directly from BGR, without a BGR to RGB round-trip
+        _, buffer = cv2.imencode(".jpg", image, ImageProcessor.JPEG_ENCODE_PARAMS)
         
-        # Save to bytes buffer
-        buffer = io.BytesIO()
-        pil_image.save(buffer, format="JPEG")
-        
-        # Encode to base64
-        base64_string = base64.b64encode(buffer.getvalue()).decode()
+        # Encode to base64 straight from the encoded array's buffer
+        base64_string = base64.b64encode(buffer).decode("ascii")
         
         return f"data:image/jpeg;base64,{base64_string}"
     
@@ -121,6 +134,11 @@ class ImageProcessor:
             new_width = max_dimension
             new_height = int(height * (max_dimension / width))
         
+        # Halve large images with the Gaussian pyramid until within 2x of the target,
+        # which is cheaper than a single large INTER_AREA step
+        while max(image.shape[:2]) >= 2 * max_dimension:
+            image = cv2.pyrDown(image)
+        
         # Resize
         resized = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_AREA)
         
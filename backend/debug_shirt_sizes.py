@@ -2,7 +2,7 @@
 import sys
 sys.path.insert(0, '/home/ideal206/Documents/virtual_tryon_updated/backend')
 
-from app.services.size_recommender import SizeRecommender
+from app.services.size_recommender import size_recommender
 from app.models.garment_specs import GarmentCategory
 
 # Test with typical male measurements (170cm height)
@@ -15,7 +15,7 @@ test_measurements = {
     'inseam': 80
 }
 
-recommender = SizeRecommender()
+recommender = size_recommender
 
 print("=" * 60)
 print("DEBUG: Shirt Size Recommendation Analysis")
@@ -29,9 +29,9 @@ print("MENS_SHIRT Size Chart:")
 print("=" * 60)
 
 # Show size chart
-import json
-with open('/home/ideal206/Documents/virtual_tryon_updated/backend/app/data/size_charts.json', 'r') as f:
-    charts = json.load(f)
+import orjson
+with open('/home/ideal206/Documents/virtual_tryon_updated/backend/app/data/size_charts.json', 'rb') as f:
+    charts = orjson.loads(f.read())
 
 print("\nSize | Chest | Waist | Shoulder | Height Range")
 print("-" * 60)
@@ -2,7 +2,7 @@
 import sys
 sys.path.insert(0, '/home/ideal206/Documents/virtual_tryon_updated/backend')
 
-import json
+import orjson
 from motor.motor_asyncio import AsyncIOMotorClient
 import asyncio
 
@@ -34,10 +34,10 @@ async def debug_latest_measurement():
         print(f"  {key}: {value} cm")
     
     # Now test size recommendations with these measurements
-    from app.services.size_recommender import SizeRecommender
+    from app.services.size_recommender import size_recommender
     from app.models.garment_specs import GarmentCategory
     
-    recommender = SizeRecommender()
+    recommender = size_recommender
     
     test_measurements = {
         'height': measurement.get('height'),
@@ -69,8 +69,8 @@ async def debug_latest_measurement():
     print("\n" + "=" * 70)
     print("SIZE CHART REFERENCE (MENS_SHIRT)")
     print("=" * 70)
-    with open('/home/ideal206/Documents/virtual_tryon_updated/backend/app/data/size_charts.json', 'r') as f:
-        charts = json.load(f)
+    with open('/home/ideal206/Documents/virtual_tryon_updated/backend/app/data/size_charts.json', 'rb') as f:
+        charts = orjson.loads(f.read())
     
     print("\nSize | Chest | Shoulder | Expected User Type")
     print("-" * 70)
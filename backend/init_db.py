@@ -19,37 +19,32 @@ async def init_database():
         print(f"✅ Connected to MongoDB at {settings.mongodb_url}")
         print(f"📊 Database: {settings.database_name}")
         
-        # Create indexes for users collection
         users_collection = db.users
+        measurements_collection = db.measurements
         
-        # Unique index on email
-        await users_collection.create_index("email", unique=True)
+        # The indexes are independent, so build them concurrently instead of
+        # paying one round-trip per index
+        await asyncio.gather(
+            # Unique indexes on users.email and users.username
+            users_collection.create_index("email", unique=True),
+            users_collection.create_index("username", unique=True),
+            # Index on created_at for sorting
+            users_collection.create_index("created_at"),
+            # Index on user_id for querying user measurements
+            measurements_collection.create_index("user_id"),
+            # Index on created_at for sorting
+            measurements_collection.create_index("created_at"),
+            # Compound index for user_id + created_at
+            measurements_collection.create_index([
+                ("user_id", 1),
+                ("created_at", -1)
+            ]),
+        )
         print("✅ Created unique index on users.email")
-        
-        # Unique index on username
-        await users_collection.create_index("username", unique=True)
         print("✅ Created unique index on users.username")
-        
-        # Index on created_at for sorting
-        await users_collection.create_index("created_at")
         print("✅ Created index on users.created_at")
-        
-        # Create indexes for measurements collection
-        measurements_collection = db.measurements
-        
-        # Index on user_id for querying user measurements
-        await measurements_collection.create_index("user_id")
         print("✅ Created index on measurements.user_id")
-        
-        # Index on created_at for sorting
-        await measurements_collection.create_index("created_at")
         print("✅ Created index on measurements.created_at")
-        
-        # Compound index for user_id + created_at
-        await measurements_collection.create_index([
-            ("user_id", 1),
-            ("created_at", -1)
-        ])
         print("✅ Created compound index on measurements (user_id, created_at)")
         
         print("\n✅ Database initialization completed successfully!")
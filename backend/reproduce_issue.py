@@ -59,7 +59,8 @@ def run_repro():
         dist = calculator.calculate_distance(l_shoulder, r_shoulder)
         print(f"\nRaw Shoulder Distance (Pixels): {dist:.2f}")
         # Get calibration factor to check matches
-        cf = calculator.calculate_calibration_factor(results['landmarks'], f_h, height_cm, results['segmentation_mask'])
+        silhouette = PoseDetector.levels_to_mask(results['segmentation_levels'], 0.5)
+        cf = calculator.calculate_calibration_factor(results['landmarks'], f_h, height_cm, silhouette)
         print(f"Calibration Factor: {cf:.4f} px/cm")
         print(f"Shoulder Width (Pixels/CF): {dist/cf:.2f} cm")
 
@@ -1,13 +1,16 @@
 """Test category-specific size recommendations."""
 import sys
-sys.path.insert(0, '/home/ideal206/Documents/virtual_tryon_updated/backend')
+import os
 
-from app.services.size_recommender import SizeRecommender
+# Add this script's directory (backend) to sys.path to import app
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.size_recommender import size_recommender
 from app.models.garment_specs import GarmentCategory
 
 def test_shirt_recommendations():
     """Test shirt size recommendations with various body types."""
-    recommender = SizeRecommender()
+    recommender = size_recommender
     
     test_cases = [
         {
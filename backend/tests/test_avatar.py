@@ -0,0 +1,44 @@
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import avatar
+from app.services.avatar_generator import avatar_generator
+
+
+def create_client():
+    app = FastAPI()
+    app.include_router(avatar.router, prefix="/api/avatar")
+    return TestClient(app)
+
+
+def test_get_avatar_image_returns_png_bytes(tmp_path, monkeypatch):
+    monkeypatch.setattr(avatar_generator, "storage_dir", str(tmp_path))
+
+    image = np.zeros((8, 4, 3), dtype=np.uint8)
+    image[:, :, 2] = 255
+    png_bytes = cv2.imencode(".png", image)[1].tobytes()
+    (tmp_path / "avatar_test123_20240101.png").write_bytes(png_bytes)
+
+    response = create_client().get("/api/avatar/test123/image")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    assert response.content == png_bytes
+
+
+def test_get_avatar_image_unknown_id_is_404(tmp_path, monkeypatch):
+    monkeypatch.setattr(avatar_generator, "storage_dir", str(tmp_path))
+
+    response = create_client().get("/api/avatar/missing/image")
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Avatar not found"
@@ -0,0 +1,45 @@
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import fit_analysis
+
+
+def test_recommend_size_batch_matches_single_user_route():
+    app = FastAPI()
+    app.include_router(fit_analysis.router, prefix="/api/fit")
+    client = TestClient(app)
+
+    users = [
+        {'shoulder_width': 45, 'chest': 100, 'waist': 85, 'hip': 98},
+        {'shoulder_width': 42, 'chest': 92, 'waist': 78},
+        {'chest': 110, 'waist': 96},
+    ]
+
+    for garment_id in fit_analysis.SAMPLE_GARMENTS:
+        batch = client.post(
+            "/api/fit/recommend-size-batch",
+            json={'garment_id': garment_id, 'measurements': users}
+        )
+        assert batch.status_code == 200
+        results = batch.json()['results']
+        assert len(results) == len(users)
+
+        for user, result in zip(users, results):
+            single = client.post(
+                "/api/fit/recommend-size",
+                json={'garment_id': garment_id, 'measurements': user}
+            )
+            assert single.status_code == 200
+            expected = single.json()
+            assert result == {
+                'recommended_size': expected['recommended_size'],
+                'fit_score': expected['fit_score'],
+                'fit_category': expected['fit_category'],
+            }, (garment_id, user)
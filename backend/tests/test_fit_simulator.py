@@ -0,0 +1,38 @@
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.fit_simulator import FitSimulator
+from app.models.schemas import Measurements
+from app.models.garment_data import GarmentSpec
+
+
+def test_analyze_fit_batch_matches_scalar():
+    simulator = FitSimulator()
+
+    users = [
+        Measurements(shoulder_width=45, chest=100, waist=85, hip=98, inseam=80),
+        Measurements(shoulder_width=42, chest=92, waist=78),
+        Measurements(chest=110, hip=112, inseam=76),
+        Measurements(),
+    ]
+    garments = [
+        GarmentSpec(size="S", shoulder_width=42, chest=92, waist=88),
+        GarmentSpec(size="M", shoulder_width=45, chest=98, waist=94, hip=100, inseam=81),
+        GarmentSpec(size="L", shoulder_width=48, chest=104, waist=100, hip=106, inseam=90),
+        GarmentSpec(size="XL", shoulder_width=51, chest=120, waist=106, hip=125, inseam=70),
+    ]
+
+    scores = simulator.analyze_fit_batch(
+        simulator.to_batch_array(users),
+        simulator.to_batch_array(garments)
+    )
+
+    assert scores.shape == (len(users), len(garments))
+    for i, user in enumerate(users):
+        for j, garment in enumerate(garments):
+            expected = simulator.analyze_fit(user, garment)["overall_fit_score"]
+            assert scores[i, j] == expected, (user, garment.size)
@@ -1,4 +1,5 @@
 
+import cv2
 import numpy as np
 import sys
 import os
@@ -7,10 +8,11 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.services.measurement_calculator import MeasurementCalculator
-from app.services.pose_detector import PoseLandmark
+from app.services.pose_detector import PoseDetector, PoseLandmark
 
 def create_mock_mask(height, width, top_y, bottom_y, waist_y, shoulder_y, hip_y):
-    mask = np.zeros((height, width), dtype=np.float32)
+    # Boolean mask, i.e. already thresholded silhouette pixels
+    mask = np.zeros((height, width), dtype=bool)
     
     # Simple hourglass shape for testing
     for y in range(top_y, bottom_y):
@@ -33,35 +35,43 @@ def create_mock_mask(height, width, top_y, bottom_y, waist_y, shoulder_y, hip_y)
             
         start_x = int(cx - current_w // 2)
         end_x = int(cx + current_w // 2)
-        mask[y, start_x:end_x] = 1.0
+        mask[y, start_x:end_x] = True
         
     return mask
 
+def create_mock_landmarks():
+    # Define landmark positions (initialize all 33) as x, y, z, visibility rows,
+    # the same layout as PoseDetector's landmarks_array
+    landmarks = np.zeros((33, 4))
+    
+    landmarks[PoseLandmark.NOSE] = (0.5, 0.1, 0, 0.9)
+    landmarks[PoseLandmark.LEFT_SHOULDER] = (0.4, 0.2, 0, 0.9)
+    landmarks[PoseLandmark.RIGHT_SHOULDER] = (0.6, 0.2, 0, 0.9)
+    # For a person spanning 0.1 to 0.9 (Total range 0.8), torso is 0.8 * 0.28 = 0.224
+    # Shoulder y is 0.2, so Hip y should be 0.2 + 0.224 = 0.424
+    landmarks[PoseLandmark.LEFT_HIP] = (0.42, 0.424, 0, 0.9)
+    landmarks[PoseLandmark.RIGHT_HIP] = (0.58, 0.424, 0, 0.9)
+    landmarks[PoseLandmark.LEFT_KNEE] = (0.43, 0.7, 0, 0.9)
+    landmarks[PoseLandmark.RIGHT_KNEE] = (0.57, 0.7, 0, 0.9)
+    landmarks[PoseLandmark.LEFT_ANKLE] = (0.45, 0.9, 0, 0.9)
+    landmarks[PoseLandmark.RIGHT_ANKLE] = (0.55, 0.9, 0, 0.9)
+    
+    return landmarks
+
 def test_measurement_refinement():
     calculator = MeasurementCalculator()
     
     # Mock data dimensions
     h, w = 1000, 800
     
-    # Define landmark positions (initialize all 33)
-    landmarks = [{'x': 0, 'y': 0, 'z': 0, 'visibility': 0} for _ in range(33)]
-    
-    landmarks[PoseLandmark.NOSE] = {'x': 0.5, 'y': 0.1, 'z': 0, 'visibility': 0.9}
-    landmarks[PoseLandmark.LEFT_SHOULDER] = {'x': 0.4, 'y': 0.2, 'z': 0, 'visibility': 0.9}
-    landmarks[PoseLandmark.RIGHT_SHOULDER] = {'x': 0.6, 'y': 0.2, 'z': 0, 'visibility': 0.9}
-    # For a person spanning 0.1 to 0.9 (Total range 0.8), torso is 0.8 * 0.28 = 0.224
-    # Shoulder y is 0.2, so Hip y should be 0.2 + 0.224 = 0.424
-    landmarks[PoseLandmark.LEFT_HIP] = {'x': 0.42, 'y': 0.424, 'z': 0, 'visibility': 0.9}
-    landmarks[PoseLandmark.RIGHT_HIP] = {'x': 0.58, 'y': 0.424, 'z': 0, 'visibility': 0.9}
-    landmarks[PoseLandmark.LEFT_KNEE] = {'x': 0.43, 'y': 0.7, 'z': 0, 'visibility': 0.9}
-    landmarks[PoseLandmark.RIGHT_KNEE] = {'x': 0.57, 'y': 0.7, 'z': 0, 'visibility': 0.9}
-    landmarks[PoseLandmark.LEFT_ANKLE] = {'x': 0.45, 'y': 0.9, 'z': 0, 'visibility': 0.9}
-    landmarks[PoseLandmark.RIGHT_ANKLE] = {'x': 0.55, 'y': 0.9, 'z': 0, 'visibility': 0.9}
+    landmarks = create_mock_landmarks()
     
     # Create mask: shoulder width is 0.2*800=160px.
     # At 170cm, cf = (0.9-0.1)*1000 / 170 = 4.7 px/cm
     # 160px / 4.7 = 34cm shoulder width.
     mask = create_mock_mask(h, w, 100, 900, 380, 200, 500)
+    # Shared by every scenario, so make sure the calculator never writes to it
+    mask.flags.writeable = False
     
     # SCENARIO 1: High Confidence
     print("--- SCENARIO 1: High Confidence (Confidence = 0.9) ---")
@@ -95,10 +105,10 @@ def test_measurement_refinement():
         
     # SCENARIO 3: Ankle Cutoff (Should trigger Torso Calibration)
     print("\n--- SCENARIO 3: Ankle Cutoff (Shoulder-to-Hip Calibration) ---")
-    cutoff_landmarks = [lm.copy() for lm in landmarks]
+    cutoff_landmarks = landmarks.copy()
     # Set ankles to very bottom edge
-    cutoff_landmarks[PoseLandmark.LEFT_ANKLE]['y'] = 0.99 
-    cutoff_landmarks[PoseLandmark.RIGHT_ANKLE]['y'] = 0.99
+    cutoff_landmarks[PoseLandmark.LEFT_ANKLE, 1] = 0.99 
+    cutoff_landmarks[PoseLandmark.RIGHT_ANKLE, 1] = 0.99
     
     front_landmarks_cutoff = {
         'landmarks': cutoff_landmarks,
@@ -137,8 +147,89 @@ def test_measurement_refinement():
     assert 75 < res_broken['waist'] < 90
     print(f"  [PASS] res_broken['waist'] ({res_broken['waist']}) fell back to AE correctly.")
 
+    # SCENARIO 5: Raw Inputs (float32 mask and landmark dicts, as MediaPipe hands them over)
+    print("\n--- SCENARIO 5: Raw Inputs (Float Mask, Dict Landmarks) ---")
+    front_landmarks_raw = {
+        'landmarks': [
+            {'x': x, 'y': y, 'z': z, 'visibility': visibility}
+            for x, y, z, visibility in landmarks
+        ],
+        'image_height': h,
+        'image_width': w,
+        'segmentation_mask': mask.astype(np.float32),
+        'confidence': 0.9
+    }
+
+    res_raw = calculator.calculate_measurements(front_landmarks_raw, None, 170.0, gender="male")
+
+    assert res_raw == res_high
+    print("  [PASS] Raw inputs match the boolean mask / landmark array results.")
+
     print("\nAll logic validation PASSED!")
 
+def test_quantized_mask_levels_match_float_mask():
+    calculator = MeasurementCalculator()
+    h, w = 1000, 800
+    landmarks = create_mock_landmarks()
+    
+    # Soft edges, so the 0.5 silhouette and 0.7 body thresholds select different pixels
+    soft_mask = cv2.GaussianBlur(create_mock_mask(h, w, 100, 900, 380, 200, 500).astype(np.float32), (41, 41), 0)
+    view = {'landmarks': landmarks, 'image_height': h, 'image_width': w, 'confidence': 0.9}
+    float_view = dict(view, segmentation_mask=soft_mask)
+    levels_view = dict(view, segmentation_levels=PoseDetector.quantize_mask(soft_mask))
+    
+    # Front only, and front plus side
+    assert (
+        calculator.calculate_measurements(levels_view, None, 170.0, gender="male")
+        == calculator.calculate_measurements(float_view, None, 170.0, gender="male")
+    )
+    assert (
+        calculator.calculate_measurements(levels_view, levels_view, 170.0, gender="male")
+        == calculator.calculate_measurements(float_view, float_view, 170.0, gender="male")
+    )
+
+def test_uint8_mask_is_thresholded_like_float_mask():
+    calculator = MeasurementCalculator()
+    h, w = 1000, 800
+    landmarks = create_mock_landmarks()
+    
+    # A plain 0/1 uint8 silhouette is an ordinary mask, not quantized levels
+    mask = create_mock_mask(h, w, 100, 900, 380, 200, 500)
+    view = {'landmarks': landmarks, 'image_height': h, 'image_width': w, 'confidence': 0.9}
+    
+    assert (
+        calculator.calculate_measurements(dict(view, segmentation_mask=mask.astype(np.uint8)), None, 170.0, gender="male")
+        == calculator.calculate_measurements(dict(view, segmentation_mask=mask.astype(np.float32)), None, 170.0, gender="male")
+    )
+
+def test_segmentation_levels_are_thresholded_per_region(monkeypatch):
+    calculator = MeasurementCalculator()
+    h, w = 1000, 800
+    landmarks = create_mock_landmarks()
+    
+    soft_mask = cv2.GaussianBlur(create_mock_mask(h, w, 100, 900, 380, 200, 500).astype(np.float32), (41, 41), 0)
+    view = {
+        'landmarks': landmarks, 'image_height': h, 'image_width': w, 'confidence': 0.9,
+        'segmentation_levels': PoseDetector.quantize_mask(soft_mask)
+    }
+    
+    # Record every block the calculator thresholds
+    thresholded_shapes = []
+    threshold_mask = MeasurementCalculator._threshold_mask
+    
+    def recording_threshold_mask(segmentation_mask, threshold):
+        thresholded_shapes.append(segmentation_mask.shape)
+        return threshold_mask(segmentation_mask, threshold)
+    
+    monkeypatch.setattr(MeasurementCalculator, '_threshold_mask', staticmethod(recording_threshold_mask))
+    monkeypatch.setattr(PoseDetector, 'levels_to_mask', None)
+    
+    calculator.calculate_measurements(view, view, 170.0, gender="male")
+    
+    # Only the top-of-head blocks and the scanned bands, never the whole frame
+    assert thresholded_shapes
+    assert all(rows < h for rows, _ in thresholded_shapes)
+
 if __name__ == "__main__":
     test_measurement_refinement()
 
@@ -0,0 +1,71 @@
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.services.pose_detector import PoseDetector
+
+
+class FakePose:
+    """Stand-in for a MediaPipe Pose model whose output depends on the image."""
+    
+    def process(self, image):
+        level = float(image.mean()) / 255
+        landmarks = [
+            SimpleNamespace(x=level, y=i / 33, z=0.0, visibility=0.9)
+            for i in range(33)
+        ]
+        return SimpleNamespace(
+            pose_landmarks=SimpleNamespace(landmark=landmarks),
+            segmentation_mask=np.full(image.shape[:2], level, dtype=np.float32)
+        )
+
+
+class FailingPose:
+    def process(self, image):
+        raise RuntimeError("side model failed")
+
+
+def assert_same_result(result, expected):
+    assert result.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, np.ndarray):
+            assert np.array_equal(result[key], value)
+        else:
+            assert result[key] == value
+
+
+def create_images():
+    front_image = np.full((64, 48, 3), 200, dtype=np.uint8)
+    side_image = np.full((64, 40, 3), 100, dtype=np.uint8)
+    return front_image, side_image
+
+
+def test_detect_pair_matches_sequential_detection(monkeypatch):
+    detector = PoseDetector()
+    monkeypatch.setattr(detector, 'pose', FakePose())
+    monkeypatch.setattr(detector, 'pose_secondary', FakePose())
+    front_image, side_image = create_images()
+    
+    front_result, side_result = detector.detect_pair(front_image, side_image)
+    
+    assert_same_result(front_result, detector.detect_landmarks(front_image))
+    assert_same_result(side_result, detector.detect_landmarks(side_image))
+
+
+def test_detect_pair_side_failure_falls_back_to_front_only(monkeypatch):
+    detector = PoseDetector()
+    monkeypatch.setattr(detector, 'pose', FakePose())
+    monkeypatch.setattr(detector, 'pose_secondary', FailingPose())
+    front_image, side_image = create_images()
+    
+    front_result, side_result = detector.detect_pair(front_image, side_image)
+    
+    assert side_result is None
+    assert_same_result(front_result, detector.detect_landmarks(front_image))
@@ -0,0 +1,54 @@
+
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.size_recommender import size_recommender
+from app.models.garment_specs import GarmentCategory
+
+
+def test_vectorized_fit_scores_match_per_size_scores():
+    recommender = size_recommender
+
+    user_measurements = [
+        {'height': 170, 'shoulder_width': 45, 'chest': 95, 'waist': 80},
+        {'height': 182, 'shoulder_width': 50, 'chest': 108, 'waist': 92, 'hip': 104, 'inseam': 84},
+        {'chest': 88, 'waist': None, 'hip': 96},
+    ]
+
+    for category in GarmentCategory:
+        size_chart = recommender.db.get_size_chart(category)
+        if not size_chart:
+            continue
+        _, specs, _ = recommender._get_chart_arrays(category, size_chart)
+
+        for measurements in user_measurements:
+            scores = recommender._calculate_fit_scores(measurements, specs, category)
+            expected = [
+                recommender._calculate_fit_score(measurements, size_spec, category)[0]
+                for size_spec in size_chart.sizes.values()
+            ]
+            assert scores == expected, (category, measurements)
+
+
+def test_recommendation_measurements_are_read_only():
+    recommendations = size_recommender.recommend_sizes(
+        {'height': 170, 'shoulder_width': 45, 'chest': 95, 'waist': 80},
+        GarmentCategory.MENS_SHIRT
+    )
+    measurements = recommendations[0].measurements
+
+    try:
+        measurements['chest'] = 0
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("recommendation measurements must not be writable")
+
+    again = size_recommender.recommend_sizes(
+        {'height': 170, 'shoulder_width': 45, 'chest': 95, 'waist': 80},
+        GarmentCategory.MENS_SHIRT
+    )
+    assert again[0].measurements['chest'] == measurements['chest'] != 0